@@ -18,6 +18,7 @@ from app.models import settings
 from app.core.config import get_cors_origins
 from app.api.routes import router
 from app.middleware.error_handler import register_exception_handlers
+from app.services.grist_client import get_client_registry
 
 # ============================================================================
 # Logging Configuration
@@ -82,6 +83,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Shutting down Grist AI Assistant API...")
+    await get_client_registry().aclose_all()
 
 
 # ============================================================================
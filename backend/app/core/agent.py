@@ -4,26 +4,36 @@ Grist AI Agent
 This module implements the main agent that orchestrates the LLM and tools.
 Uses LangChain's LLM and tool binding with a custom execution loop that:
 - Properly handles function calling for all OpenAI-compatible models
-- Supports parallel tool execution
+- Runs independent read-only tool calls in parallel
 - Manages conversation history
 
 Note: We use a custom agent loop instead of LangChain's create_openai_functions_agent
 because AgentExecutor has issues with some models (returns empty intermediate_steps).
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
 
 from app.models import settings
 from app.core.llm import get_llm
+from app.core.llm_cache import CachedLLM, get_llm_cache
 from app.core.prompts import get_system_prompt
-from app.core.tools import get_all_tools
+from app.core.tools import READ_ONLY_TOOLS, get_all_tools
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_tool_schemas() -> Tuple[Dict[str, Any], ...]:
+    """OpenAI function schemas of all tools, converted once per process."""
+    return tuple(convert_to_openai_tool(tool) for tool in get_all_tools())
+
+
 class GristAgent:
     """
     Main agent for the Grist AI Assistant.
@@ -112,8 +122,18 @@ class GristAgent:
         # Create tool lookup
         self.tools_by_name = {tool.name: tool for tool in self.tools}
 
-        # Bind tools to LLM (LangChain function calling)
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        # Bind tools to LLM (LangChain function calling), reusing cached schemas
+        self.llm_with_tools = self.llm.bind_tools(list(_get_tool_schemas()))
+
+        # Answer repeated deterministic calls from the response cache
+        if settings.llm_cache_enabled:
+            self.llm_with_tools = CachedLLM(
+                self.llm_with_tools,
+                get_llm_cache(),
+                model=settings.openai_model,
+                temperature=settings.llm_temperature,
+                tools=_get_tool_schemas(),
+            )
 
         # Get system prompt
         self.system_prompt = get_system_prompt(
@@ -162,6 +182,67 @@ class GristAgent:
         await self.grist_service.close()
         logger.info("GristAgent resources cleaned up")
 
+    async def _execute_tool(
+        self, tool_name: str, tool_args: Dict[str, Any]
+    ) -> Tuple[Any, bool]:
+        """
+        Execute a single tool, converting failures into an error string.
+
+        Args:
+            tool_name: Name of a tool registered in tools_by_name
+            tool_args: Arguments for the tool
+
+        Returns:
+            Tuple of (result or "Error: ..." string, whether the call failed)
+        """
+        try:
+            logger.debug(f"Executing tool: {tool_name}...")
+            result = await self.tools_by_name[tool_name].ainvoke(tool_args)
+
+            # Log result (consolidated)
+            result_str = str(result)
+            preview = result_str[:200] if len(result_str) > 200 else result_str
+            logger.debug(
+                f"Tool result: {preview}{'...' if len(result_str) > 200 else ''}"
+            )
+            logger.info(f"✅ Tool '{tool_name}' executed successfully")
+            return result, False
+
+        except Exception as e:
+            logger.error(f"❌ Tool '{tool_name}' failed: {str(e)}", exc_info=True)
+            return f"Error: {str(e)}", True
+
+    async def _run_tool_batch(
+        self,
+        calls: List[Tuple[Dict[str, Any], str, Dict, str]],
+        messages: List,
+        intermediate_steps: List,
+    ) -> int:
+        """
+        Execute tool calls concurrently and record their results in call order.
+
+        Args:
+            calls: (tool_call, tool_name, tool_args, tool_id) tuples
+            messages: Conversation messages, extended with one ToolMessage per call
+            intermediate_steps: Steps list, extended with (tool_call, result) tuples
+
+        Returns:
+            Number of calls that failed
+        """
+        if not calls:
+            return 0
+
+        outcomes = await asyncio.gather(
+            *(self._execute_tool(name, args) for _, name, args, _ in calls)
+        )
+
+        failed = 0
+        for (tool_call, _, _, tool_id), (result, error) in zip(calls, outcomes):
+            intermediate_steps.append((tool_call, result))
+            messages.append(ToolMessage(content=str(result), tool_call_id=tool_id))
+            failed += error
+        return failed
+
     async def run(
         self,
         user_message: str,
@@ -294,7 +375,10 @@ class GristAgent:
                     # Add AI message to conversation
                     messages.append(response)
 
-                    # Execute each tool call (in parallel via asyncio)
+                    # Execute tool calls: consecutive read-only calls run
+                    # concurrently, mutating calls run one at a time in order
+                    pending_reads: List[Tuple[Dict[str, Any], str, Dict, str]] = []
+
                     for idx, tool_call in enumerate(response.tool_calls):
                         try:
                             tool_name = tool_call["name"]
@@ -313,6 +397,20 @@ class GristAgent:
                         )
 
                         tool_call_count += 1
+                        call = (tool_call, tool_name, tool_args, tool_id)
+
+                        if (
+                            tool_name in READ_ONLY_TOOLS
+                            and tool_name in self.tools_by_name
+                        ):
+                            pending_reads.append(call)
+                            continue
+
+                        # Mutating (or unknown) tool: flush reads requested before it
+                        failed_tool_calls += await self._run_tool_batch(
+                            pending_reads, messages, intermediate_steps
+                        )
+                        pending_reads = []
 
                         if tool_name in self.tools_by_name:
                             # Check if this operation requires confirmation
@@ -358,58 +456,9 @@ class GristAgent:
                                     intermediate_steps.append((tool_call, error_msg))
                                     continue
 
-                            try:
-                                # Execute the tool
-                                logger.debug(f"Executing tool: {tool_name}...")
-                                tool = self.tools_by_name[tool_name]
-                                result = await tool.ainvoke(tool_args)
-
-                                # Log result (consolidated)
-                                result_str = str(result)
-                                preview = (
-                                    result_str[:200]
-                                    if len(result_str) > 200
-                                    else result_str
-                                )
-                                logger.debug(
-                                    f"Tool result: {preview}{'...' if len(result_str) > 200 else ''}"
-                                )
-
-                                # Track step
-                                intermediate_steps.append((tool_call, result))
-
-                                # Add tool result to messages
-                                messages.append(
-                                    ToolMessage(
-                                        content=str(result),
-                                        tool_call_id=tool_id,
-                                    )
-                                )
-                                logger.info(
-                                    f"✅ Tool '{tool_name}' executed successfully"
-                                )
-
-                            except Exception as e:
-                                failed_tool_calls += 1
-                                error_msg = (
-                                    f"Error executing tool {tool_name}: {str(e)}"
-                                )
-                                logger.error(
-                                    f"❌ Tool '{tool_name}' failed: {str(e)}",
-                                    exc_info=True,
-                                )
-
-                                # Add error message
-                                messages.append(
-                                    ToolMessage(
-                                        content=f"Error: {str(e)}",
-                                        tool_call_id=tool_id,
-                                    )
-                                )
-
-                                intermediate_steps.append(
-                                    (tool_call, f"Error: {str(e)}")
-                                )
+                            failed_tool_calls += await self._run_tool_batch(
+                                [call], messages, intermediate_steps
+                            )
                         else:
                             error_msg = f"Tool {tool_name} not found"
                             logger.error(error_msg)
@@ -420,6 +469,10 @@ class GristAgent:
                                 )
                             )
 
+                    failed_tool_calls += await self._run_tool_batch(
+                        pending_reads, messages, intermediate_steps
+                    )
+
                     # Continue loop to get next LLM response
                     continue
 
@@ -81,6 +81,15 @@ class Settings(BaseSettings):
     llm_max_retries: int = 2
     """Maximum number of retries for failed LLM requests"""
 
+    llm_cache_enabled: bool = False
+    """Cache LLM responses for identical deterministic calls (temperature 0 only)"""
+
+    llm_cache_ttl: int = 300
+    """How long a cached LLM response stays valid, in seconds"""
+
+    llm_cache_max_entries: int = 256
+    """Maximum number of cached LLM responses (least recently used evicted)"""
+
     # ========================================================================
     # Grist Settings
     # ========================================================================
@@ -5,10 +5,12 @@ Handles confirmation workflow for destructive operations in the agent.
 Combines confirmation service and handler logic.
 """
 
+import functools
+import heapq
 import logging
-import uuid
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import secrets
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.models import (
     ConfirmationRequest,
@@ -32,8 +34,12 @@ class ConfirmationService:
 
     def __init__(self):
         """Initialize the confirmation service."""
-        # Store pending confirmations: {confirmation_id: (request, created_at)}
-        self._pending: Dict[str, tuple[ConfirmationRequest, datetime]] = {}
+        # Store pending confirmations: {confirmation_id: (request, expires_at_ns)}
+        self._pending: Dict[str, Tuple[ConfirmationRequest, int]] = {}
+        # Min-heap of (expires_at_ns, confirmation_id), monotonic clock. Entries of
+        # approved/rejected confirmations stay until they expire; due entries are
+        # popped on every create, so the heap only holds the last TTL's worth.
+        self._expiry_heap: List[Tuple[int, str]] = []
 
     def create_confirmation(
         self,
@@ -56,7 +62,10 @@ class ConfirmationService:
         Returns:
             ConfirmationRequest object
         """
-        confirmation_id = f"conf_{uuid.uuid4().hex[:12]}"
+        # Drop due entries first so the heap stays bounded
+        self.cleanup_expired()
+
+        confirmation_id = "conf_" + secrets.token_urlsafe(9)
 
         request = ConfirmationRequest(
             confirmation_id=confirmation_id,
@@ -67,7 +76,9 @@ class ConfirmationService:
         )
 
         # Store in pending confirmations
-        self._pending[confirmation_id] = (request, datetime.now())
+        expires_at = time.monotonic_ns() + expires_in_seconds * 1_000_000_000
+        self._pending[confirmation_id] = (request, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, confirmation_id))
 
         logger.info(
             f"Created confirmation request {confirmation_id} for {tool_name} "
@@ -90,11 +101,10 @@ class ConfirmationService:
             logger.warning(f"Confirmation {confirmation_id} not found")
             return None
 
-        request, created_at = self._pending[confirmation_id]
+        request, expires_at = self._pending[confirmation_id]
 
         # Check if expired
-        expires_at = created_at + timedelta(seconds=request.expires_in_seconds)
-        if datetime.now() > expires_at:
+        if time.monotonic_ns() >= expires_at:
             logger.warning(f"Confirmation {confirmation_id} has expired")
             # Clean up expired confirmation
             del self._pending[confirmation_id]
@@ -148,21 +158,20 @@ class ConfirmationService:
         Returns:
             Number of confirmations cleaned up
         """
-        now = datetime.now()
-        expired_ids = []
-
-        for conf_id, (request, created_at) in self._pending.items():
-            expires_at = created_at + timedelta(seconds=request.expires_in_seconds)
-            if now > expires_at:
-                expired_ids.append(conf_id)
+        now = time.monotonic_ns()
+        heap = self._expiry_heap
+        cleaned = 0
 
-        for conf_id in expired_ids:
-            del self._pending[conf_id]
+        # Only pop entries that are already due: O(k log n) for k expired entries
+        while heap and heap[0][0] <= now:
+            _, conf_id = heapq.heappop(heap)
+            if self._pending.pop(conf_id, None) is not None:
+                cleaned += 1
 
-        if expired_ids:
-            logger.info(f"Cleaned up {len(expired_ids)} expired confirmations")
+        if cleaned:
+            logger.info(f"Cleaned up {cleaned} expired confirmations")
 
-        return len(expired_ids)
+        return cleaned
 
     def get_pending_count(self) -> int:
         """Get the number of pending confirmations."""
@@ -173,6 +182,7 @@ class ConfirmationService:
     def clear_all(self) -> None:
         """Clear all pending confirmations (for testing)."""
         self._pending.clear()
+        self._expiry_heap.clear()
         logger.info("Cleared all pending confirmations")
 
 
@@ -339,10 +349,7 @@ class ConfirmationHandler:
         return operation_map.get(tool_name, OperationType.UPDATE_RECORDS)
 
 
-# Global confirmation service instance
-_confirmation_service: Optional[ConfirmationService] = None
-
-
+@functools.cache
 def get_confirmation_service() -> ConfirmationService:
     """
     Get the global confirmation service instance.
@@ -350,13 +357,21 @@ def get_confirmation_service() -> ConfirmationService:
     Returns:
         ConfirmationService singleton
     """
-    global _confirmation_service
-    if _confirmation_service is None:
-        _confirmation_service = ConfirmationService()
-    return _confirmation_service
+    return ConfirmationService()
+
+
+# Confirmation rules per tool: predicate on the tool arguments
+_CONFIRMATION_RULES: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    # Always require confirmation for deletions
+    "remove_records": lambda args: True,
+    "remove_table_column": lambda args: True,
+    # Require confirmation for bulk updates (>5 records)
+    "update_records": lambda args: len(args.get("record_ids", [])) > 5,
+    # Require confirmation for column type changes
+    "update_table_column": lambda args: "col_type" in args,
+}
 
 
-# Helper function to determine if an operation requires confirmation
 def requires_confirmation(tool_name: str, tool_args: Dict[str, Any]) -> bool:
     """
     Determine if a tool operation requires user confirmation.
@@ -368,20 +383,5 @@ def requires_confirmation(tool_name: str, tool_args: Dict[str, Any]) -> bool:
     Returns:
         True if confirmation is required, False otherwise
     """
-    # Always require confirmation for deletions
-    if tool_name in ["remove_records", "remove_table_column"]:
-        return True
-
-    # Require confirmation for bulk updates (>5 records)
-    if tool_name == "update_records":
-        record_ids = tool_args.get("record_ids", [])
-        if len(record_ids) > 5:
-            return True
-
-    # Require confirmation for column type changes
-    if tool_name == "update_table_column":
-        # Check if changing the type
-        if "col_type" in tool_args:
-            return True
-
-    return False
+    rule = _CONFIRMATION_RULES.get(tool_name)
+    return rule is not None and rule(tool_args)
@@ -0,0 +1,205 @@
+"""
+LLM Response Cache
+
+Caches LLM responses for deterministic calls (temperature == 0), so that an
+identical conversation sent to the same model with the same tools is answered
+from memory instead of a new API round-trip.
+
+The storage is pluggable through the CacheBackend protocol; an in-process LRU
+backend with TTL is provided.
+"""
+
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Sequence, Tuple
+
+import orjson
+from langchain_core.messages import BaseMessage
+
+from app.models import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    """Storage backend for cached LLM responses."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under key."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        ...
+
+
+class MemoryBackend:
+    """In-process LRU cache with a per-entry time-to-live."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 300):
+        """
+        Initialize the memory backend.
+
+        Args:
+            max_entries: Maximum number of entries kept (least recently used evicted)
+            ttl_seconds: How long an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # {key: (expires_at, value)}, ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _message_key(message: BaseMessage) -> Dict[str, Any]:
+    """Fields of a message that determine the LLM output (ids and metadata excluded)."""
+    return {
+        "type": message.type,
+        "content": message.content,
+        "tool_calls": getattr(message, "tool_calls", None) or None,
+        "tool_call_id": getattr(message, "tool_call_id", None),
+    }
+
+
+class LLMCache:
+    """Response cache keyed by model, conversation and bound tools."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (defaults to a MemoryBackend from settings)
+        """
+        self.backend = backend or MemoryBackend(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl,
+        )
+
+    @staticmethod
+    def make_key(
+        model: str, messages: Sequence[BaseMessage], tools: Sequence[Any]
+    ) -> str:
+        """
+        Build the cache key for a call.
+
+        Args:
+            model: Model name
+            messages: Conversation sent to the LLM
+            tools: Tool schemas bound to the LLM
+
+        Returns:
+            Hex BLAKE2b (128-bit) digest identifying the call
+        """
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "messages": [_message_key(m) for m in messages],
+                "tools": list(tools),
+            },
+            default=str,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.backend.set(key, value)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+class CachedLLM:
+    """
+    Wraps a tool-bound LLM so deterministic ainvoke calls go through an LLMCache.
+
+    Calls are only cached when temperature is 0; otherwise they pass straight
+    through. Any other attribute is delegated to the wrapped LLM.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        cache: LLMCache,
+        model: str,
+        temperature: float,
+        tools: Sequence[Any] = (),
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            llm: LLM (usually with tools bound) to wrap
+            cache: Cache storing the responses
+            model: Model name, part of the cache key
+            temperature: Sampling temperature; caching is bypassed unless 0
+            tools: Tool schemas bound to the LLM, part of the cache key
+        """
+        self.llm = llm
+        self.cache = cache
+        self.model = model
+        self.temperature = temperature
+        self.tools = tools
+
+    async def ainvoke(self, messages: Sequence[BaseMessage], *args, **kwargs) -> Any:
+        """Invoke the LLM, answering from the cache for deterministic calls."""
+        if self.temperature != 0 or args or kwargs:
+            return await self.llm.ainvoke(messages, *args, **kwargs)
+
+        key = self.cache.make_key(self.model, messages, self.tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit ({key[:12]})")
+            return cached.model_copy()
+
+        response = await self.llm.ainvoke(messages)
+        self.cache.set(key, response)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+
+@functools.cache
+def get_llm_cache() -> LLMCache:
+    """
+    Get the global LLM cache instance.
+
+    Returns:
+        Singleton LLMCache instance
+    """
+    return LLMCache()
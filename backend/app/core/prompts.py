@@ -9,30 +9,9 @@ from datetime import datetime
 from typing import Optional
 
 
-def get_system_prompt(
-    current_page_name: str = "data",
-    current_page_id: int = 1,
-    current_date: Optional[str] = None,
-    current_table_id: Optional[str] = None,
-    current_table_name: Optional[str] = None,
-) -> str:
-    """
-    Génère le prompt système pour l'assistant IA Grist.
-
-    Args:
-        current_page_name: Nom de la page actuellement visualisée par l'utilisateur
-        current_page_id: ID de la page actuelle
-        current_date: Date actuelle au format "Month Day, Year". Si None, utilise la date du jour.
-        current_table_id: ID de la table actuellement visualisée par l'utilisateur
-        current_table_name: Nom de la table actuellement visualisée
-
-    Returns:
-        Prompt système complet sous forme de chaîne
-    """
-    if current_date is None:
-        current_date = datetime.now().strftime("%B %d, %Y")
-
-    return f"""<system>
+# Partie statique du prompt, identique pour toutes les requêtes : placée en tête pour
+# bénéficier du cache de prompt côté fournisseur (seul le bloc <context> varie).
+SYSTEM_PROMPT_PREFIX = """<system>
 Vous êtes un assistant IA pour l'instance [Grist](https://grist.numerique.gouv.fr) de la DINUM, une feuille de calcul collaborative qui fait aussi office de base de données. Répondez uniquement en français.
 </system>
 
@@ -235,7 +214,35 @@ Quelle colonne souhaitez-vous supprimer ?
 
 </examples>
 
-<context>
+"""
+
+
+def get_system_prompt(
+    current_page_name: str = "data",
+    current_page_id: int = 1,
+    current_date: Optional[str] = None,
+    current_table_id: Optional[str] = None,
+    current_table_name: Optional[str] = None,
+) -> str:
+    """
+    Génère le prompt système pour l'assistant IA Grist.
+
+    Args:
+        current_page_name: Nom de la page actuellement visualisée par l'utilisateur
+        current_page_id: ID de la page actuelle
+        current_date: Date actuelle au format "Month Day, Year". Si None, utilise la date du jour.
+        current_table_id: ID de la table actuellement visualisée par l'utilisateur
+        current_table_name: Nom de la table actuellement visualisée
+
+    Returns:
+        Prompt système complet sous forme de chaîne
+    """
+    if current_date is None:
+        current_date = datetime.now().strftime("%B %d, %Y")
+
+    context = f"""<context>
 La date actuelle est {current_date}. L'utilisateur est actuellement sur la page {current_page_name} (id: {current_page_id}).
 {f'''L'utilisateur visualise la table '{current_table_name}' (id: {current_table_id}).''' if current_table_id else ""}
 </context>"""
+
+    return SYSTEM_PROMPT_PREFIX + context
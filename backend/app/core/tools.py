@@ -13,7 +13,8 @@ Note: Tools receive the GristService instance via a context variable set by the
 """
 
 from contextvars import ContextVar
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
@@ -482,16 +483,18 @@ async def get_available_custom_widgets() -> List[Dict[str, str]]:
 # ============================================================================
 
 
-def get_all_tools() -> List:
+@lru_cache(maxsize=1)
+def get_all_tools() -> Tuple:
     """
     Returns all available tools for the agent.
 
     Total: 13 tools using documented Grist REST API endpoints only.
+    The registry is static, so it is built once and shared (as a tuple).
 
     Returns:
-        List of tool functions.
+        Tuple of tool functions.
     """
-    return [
+    return (
         # Table inspection (3 tools)
         get_tables,
         get_table_columns,
@@ -511,4 +514,17 @@ def get_all_tools() -> List:
         # Utilities (2 tools)
         get_grist_access_rules_reference,
         get_available_custom_widgets,
-    ]
+    )
+
+
+# Tools that only read the document: safe to run concurrently within one turn
+READ_ONLY_TOOLS = frozenset(
+    {
+        "get_tables",
+        "get_table_columns",
+        "get_sample_records",
+        "query_document",
+        "get_grist_access_rules_reference",
+        "get_available_custom_widgets",
+    }
+)
@@ -7,6 +7,7 @@ Pydantic models for request and response validation.
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 
 
 class UIMessage(BaseModel):
@@ -63,7 +64,8 @@ class ChatRequest(BaseModel):
         }
 
 
-class ToolCall(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ToolCall:
     """Information about a tool call made by the agent."""
 
     tool_name: str = Field(..., description="Name of the tool called")
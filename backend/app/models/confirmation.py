@@ -6,7 +6,8 @@ Models for handling destructive operations that require user confirmation.
 
 from typing import Any, Dict, List, Optional
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 
 
 class OperationType(str, Enum):
@@ -28,7 +29,29 @@ class ConfirmationStatus(str, Enum):
     EXPIRED = "expired"
 
 
-class OperationPreview(BaseModel):
+@dataclass(
+    frozen=True,
+    slots=True,
+    config=ConfigDict(
+        json_schema_extra={
+            "example": {
+                "operation_type": "delete_records",
+                "description": "Delete 15 records from table 'Students'",
+                "affected_count": 15,
+                "affected_items": [
+                    {"id": 1, "Name": "John Doe", "Age": 20},
+                    {"id": 2, "Name": "Jane Smith", "Age": 21},
+                ],
+                "warnings": [
+                    "This operation is irreversible",
+                    "Referenced records in 'Projects' table may be affected",
+                ],
+                "is_reversible": False,
+            }
+        }
+    ),
+)
+class OperationPreview:
     """Preview of what will be affected by an operation."""
 
     operation_type: OperationType
@@ -48,24 +71,6 @@ class OperationPreview(BaseModel):
         default=False, description="Whether this operation can be undone"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "operation_type": "delete_records",
-                "description": "Delete 15 records from table 'Students'",
-                "affected_count": 15,
-                "affected_items": [
-                    {"id": 1, "Name": "John Doe", "Age": 20},
-                    {"id": 2, "Name": "Jane Smith", "Age": 21},
-                ],
-                "warnings": [
-                    "This operation is irreversible",
-                    "Referenced records in 'Projects' table may be affected",
-                ],
-                "is_reversible": False,
-            }
-        }
-
 
 class ConfirmationRequest(BaseModel):
     """Request for user confirmation of a destructive operation."""
@@ -6,12 +6,15 @@ Pydantic models representing Grist data structures (tables, columns, records).
 
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 
 
 class TableInfo(BaseModel):
     """Information about a table in a Grist document."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Table ID")
     label: Optional[str] = Field(default=None, description="Table display label")
 
@@ -42,18 +45,18 @@ class ColumnFields(BaseModel):
 class Column(BaseModel):
     """Column definition in a Grist table."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="Column ID")
     fields: ColumnFields = Field(..., description="Column field properties")
 
 
-class Record(BaseModel):
-    """A single record in a Grist table."""
-
-    id: int = Field(..., description="Record ID (row ID)")
-    fields: Dict[str, Any] = Field(..., description="Record field values")
-
-    class Config:
-        json_schema_extra = {
+@dataclass(
+    frozen=True,
+    slots=True,
+    config=ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "id": 1,
                 "fields": {
@@ -62,4 +65,11 @@ class Record(BaseModel):
                     "Email": "john@example.com",
                 },
             }
-        }
+        },
+    ),
+)
+class Record:
+    """A single record in a Grist table."""
+
+    id: int = Field(..., description="Record ID (row ID)")
+    fields: Dict[str, Any] = Field(..., description="Record field values")
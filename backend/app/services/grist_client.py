@@ -5,15 +5,86 @@ HTTP client for interacting with Grist REST API.
 Uses the access token obtained from the Grist plugin API.
 """
 
+import functools
 import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
+class SharedClientRegistry:
+    """
+    Process-wide pool of HTTP clients, one per Grist base URL.
+
+    Every GristAPIClient for the same Grist instance reuses one
+    httpx.AsyncClient, so connections (and their TLS sessions) are kept alive
+    across documents and agent turns instead of being opened per request.
+
+    The shared clients refuse all cookies: they serve every user and document
+    of an instance, so a session cookie set for one must never be sent for
+    another.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Connection limit of each shared client
+            transport: Optional transport for the shared clients (for tests)
+        """
+        self.limits = httpx.Limits(max_connections=max_connections)
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for a base URL, creating it on first use.
+
+        Args:
+            base_url: Grist base URL
+
+        Returns:
+            Shared httpx.AsyncClient
+        """
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                transport=self.transport,
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            )
+            self._clients[base_url] = client
+        return client
+
+    async def aclose_all(self):
+        """Close every shared client (called on application shutdown)."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+@functools.cache
+def get_client_registry() -> SharedClientRegistry:
+    """
+    Get the global HTTP client registry.
+
+    Returns:
+        Singleton SharedClientRegistry instance
+    """
+    return SharedClientRegistry()
+
+
 class GristAPIClient:
     """
     HTTP client for Grist REST API.
@@ -50,7 +121,7 @@ class GristAPIClient:
         self.timeout = timeout
         self.use_api_key = use_api_key
 
-        # Create HTTP client with appropriate auth
+        # Request headers with appropriate auth
         headers = {"Content-Type": "application/json"}
 
         if use_api_key:
@@ -65,14 +136,17 @@ class GristAPIClient:
                 f"GristAPIClient initialized with widget token for document: {document_id}"
             )
 
-        self.client = httpx.AsyncClient(
-            headers=headers,
-            timeout=timeout,
-        )
+        # Auth and timeout are sent per request: the HTTP client is shared
+        self.headers = headers
+        self.client = get_client_registry().get(self.base_url)
 
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """
+        Release the client.
+
+        No-op: the shared HTTP client stays open for other documents and is
+        closed by SharedClientRegistry.aclose_all() at shutdown.
+        """
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -118,9 +192,12 @@ class GristAPIClient:
         logger.debug(f"{method} {path}")
 
         try:
+            kwargs.setdefault("headers", self.headers)
+            kwargs.setdefault("timeout", self.timeout)
             response = await self.client.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json()
+            # orjson decodes straight from the raw bytes, much faster than stdlib json
+            return orjson.loads(response.content)
         except httpx.HTTPError as e:
             logger.error(f"Grist API error: {e}")
             raise
@@ -8,10 +8,14 @@ Uses the GristAPIClient for actual API calls.
 import logging
 from typing import Any, Dict, List, Optional
 
+from app.models import GristAPIException
 from app.services.grist_client import GristAPIClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of records sent in a single add_records request
+ADD_RECORDS_BATCH_SIZE = 500
+
 
 class GristService:
     """
@@ -477,10 +481,25 @@ class GristService:
             for record in corrected_records:
                 formatted_records.append({"fields": record})
 
-            result = await self.client.add_records(table_id, formatted_records)
+            # Post in batches of ADD_RECORDS_BATCH_SIZE, one after another so
+            # rows keep their order and a failure stops the remaining batches
+            created_ids: List[int] = []
+            for i in range(0, len(formatted_records), ADD_RECORDS_BATCH_SIZE):
+                batch = formatted_records[i : i + ADD_RECORDS_BATCH_SIZE]
+                try:
+                    result = await self.client.add_records(table_id, batch)
+                except Exception as e:
+                    if not created_ids:
+                        raise
+                    # Earlier batches are committed: report them so a retry
+                    # does not insert them twice
+                    raise GristAPIException(
+                        f"Only {len(created_ids)} of {len(records)} record(s) were "
+                        f"added to table '{table_id}' before an error: {e}",
+                        {"table_id": table_id, "record_ids": created_ids},
+                    ) from e
+                created_ids.extend(r["id"] for r in result.get("records", []))
 
-            # Extract record IDs from response
-            created_ids = [r["id"] for r in result.get("records", [])]
             logger.debug(f"Created {len(created_ids)} records")
 
             return {"record_ids": created_ids, "count": len(created_ids)}
@@ -12,6 +12,16 @@ from app.services.grist_service import GristService
 
 logger = logging.getLogger(__name__)
 
+# Column type changes that may lose data
+LOSSY_CONVERSIONS = frozenset(
+    {
+        ("Numeric", "Int"),  # Decimals will be truncated
+        ("Text", "Int"),  # Non-numeric text will be lost
+        ("Text", "Numeric"),  # Non-numeric text will be lost
+        ("DateTime", "Date"),  # Time information will be lost
+    }
+)
+
 
 class PreviewService:
     """Service for generating operation previews."""
@@ -209,14 +219,7 @@ class PreviewService:
         ]
 
         # Check for potential data loss
-        lossy_conversions = [
-            ("Numeric", "Int"),  # Decimals will be truncated
-            ("Text", "Int"),  # Non-numeric text will be lost
-            ("Text", "Numeric"),  # Non-numeric text will be lost
-            ("DateTime", "Date"),  # Time information will be lost
-        ]
-
-        if (old_type, new_type) in lossy_conversions:
+        if (old_type, new_type) in LOSSY_CONVERSIONS:
             warnings.append(
                 f"⚠️ PERTE DE DONNÉES POTENTIELLE : La conversion de {old_type} vers {new_type} peut perdre des informations"
             )
@@ -10,7 +10,7 @@ Provides validation logic for Grist operations:
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from app.models import (
     ChoiceValidationException,
@@ -45,6 +45,9 @@ class ValidationService:
         """
         self.grist_service = grist_service
         self._tables_cache: Optional[List[Dict[str, Any]]] = None
+        # Lookups derived from _tables_cache: exact ids and {lowercase id: id}
+        self._table_ids: FrozenSet[str] = frozenset()
+        self._table_ids_lower: Dict[str, str] = {}
         self._columns_cache: Dict[str, List[Dict[str, Any]]] = {}
 
     async def validate_table_exists(self, table_id: str) -> str:
@@ -62,23 +65,25 @@ class ValidationService:
         """
         if self._tables_cache is None:
             self._tables_cache = await self.grist_service.get_tables()
-
-        table_ids = [t["id"] for t in self._tables_cache]
+            self._table_ids = frozenset(t["id"] for t in self._tables_cache)
+            self._table_ids_lower = {}
+            for t in self._tables_cache:
+                self._table_ids_lower.setdefault(t["id"].lower(), t["id"])
 
         # Exact match first
-        if table_id in table_ids:
+        if table_id in self._table_ids:
             logger.debug(f"Table '{table_id}' validated (exact match)")
             return table_id
 
         # Case-insensitive match
-        table_id_lower = table_id.lower()
-        for tid in table_ids:
-            if tid.lower() == table_id_lower:
-                logger.debug(
-                    f"Table '{table_id}' validated (case-insensitive match: '{tid}')"
-                )
-                return tid
+        tid = self._table_ids_lower.get(table_id.lower())
+        if tid is not None:
+            logger.debug(
+                f"Table '{table_id}' validated (case-insensitive match: '{tid}')"
+            )
+            return tid
 
+        table_ids = [t["id"] for t in self._tables_cache]
         raise TableNotFoundException(table_id, table_ids)
 
     async def validate_column_exists(
@@ -321,5 +326,7 @@ class ValidationService:
     def clear_cache(self) -> None:
         """Clear the validation cache."""
         self._tables_cache = None
+        self._table_ids = frozenset()
+        self._table_ids_lower = {}
         self._columns_cache = {}
         logger.debug("Validation cache cleared")
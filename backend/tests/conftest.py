@@ -4,13 +4,15 @@ Pytest Configuration and Shared Fixtures
 This file contains fixtures that are available to all tests.
 """
 
+import asyncio
 import os
 import pytest
-from typing import Any, Dict, List
-from unittest.mock import AsyncMock, MagicMock, patch
+import pytest_asyncio
+from pytest_asyncio import is_async_test
+from typing import Any, AsyncIterator, Dict, List
 from dotenv import load_dotenv
 
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
 # Load .env file first
 load_dotenv()
@@ -24,8 +26,8 @@ if "GRIST_BASE_URL" not in os.environ:
 
 from app.api.main import app
 from app.models import Settings
-from app.services.grist_client import GristAPIClient
 from app.services.grist_service import GristService
+from tests.fakes import FakeGristClient
 
 
 # ============================================================================
@@ -150,80 +152,8 @@ def sample_records() -> Dict[str, List[Dict[str, Any]]]:
 
 @pytest.fixture
 def mock_grist_client(sample_tables, sample_columns, sample_records):
-    """Mock GristAPIClient with sample data."""
-    mock_client = AsyncMock(spec=GristAPIClient)
-
-    # Mock get_tables
-    mock_client.get_tables.return_value = sample_tables
-
-    # Mock get_table_columns
-    async def get_table_columns(table_id: str):
-        return sample_columns.get(table_id, [])
-
-    mock_client.get_table_columns.side_effect = get_table_columns
-
-    # Mock get_records
-    async def get_records(table_id: str, limit: int = None):
-        records = sample_records.get(table_id, [])
-        return records[:limit] if limit else records
-
-    mock_client.get_records.side_effect = get_records
-
-    # Mock query_sql
-    async def query_sql(query: str, args: List = None):
-        # Simple mock: return all students for any query
-        return sample_records.get("Students", [])
-
-    mock_client.query_sql.side_effect = query_sql
-
-    # Mock add_records
-    async def add_records(table_id: str, records: List[Dict[str, Any]]):
-        return {
-            "records": [{"id": i + 100, **record} for i, record in enumerate(records)]
-        }
-
-    mock_client.add_records.side_effect = add_records
-
-    # Mock update_records
-    async def update_records(table_id: str, records: List[Dict[str, Any]]):
-        return {"updated": len(records)}
-
-    mock_client.update_records.side_effect = update_records
-
-    # Mock delete_records
-    async def delete_records(table_id: str, record_ids: List[int]):
-        return {"deleted": len(record_ids)}
-
-    mock_client.delete_records.side_effect = delete_records
-
-    # Mock add_table
-    async def add_table(table_id: str, columns: List[Dict[str, Any]]):
-        return {"table_id": table_id, "columns": len(columns)}
-
-    mock_client.add_table.side_effect = add_table
-
-    # Mock add_column
-    async def add_column(table_id: str, column_id: str, fields: Dict[str, Any]):
-        return {"column_id": column_id}
-
-    mock_client.add_column.side_effect = add_column
-
-    # Mock update_column
-    async def update_column(table_id: str, column_id: str, fields: Dict[str, Any]):
-        return {"updated": True}
-
-    mock_client.update_column.side_effect = update_column
-
-    # Mock delete_column
-    async def delete_column(table_id: str, column_id: str):
-        return {"deleted": True}
-
-    mock_client.delete_column.side_effect = delete_column
-
-    # Mock close
-    mock_client.close = AsyncMock()
-
-    return mock_client
+    """Fake GristAPIClient serving the sample data (see tests/fakes.py)."""
+    return FakeGristClient(sample_tables, sample_columns, sample_records)
 
 
 @pytest.fixture
@@ -244,39 +174,34 @@ def mock_grist_service(
     return service
 
 
-@pytest.fixture
-def mock_llm():
-    """Mock LangChain LLM for agent testing."""
-    with patch("app.core.llm.ChatOpenAI") as mock:
-        # Create a mock LLM instance
-        mock_instance = MagicMock()
-
-        # Mock ainvoke to return a simple AIMessage
-        async def ainvoke(messages):
-            from langchain_core.messages import AIMessage
+# ============================================================================
+# API Test Fixtures
+# ============================================================================
 
-            return AIMessage(content="Mock LLM response")
 
-        mock_instance.ainvoke = ainvoke
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def api_client() -> AsyncIterator[AsyncClient]:
+    """Async HTTP client bound to the app through ASGI (shared across the session)."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
 
-        # Mock bind_tools to return itself
-        mock_instance.bind_tools = MagicMock(return_value=mock_instance)
 
-        # Configure the mock to return our instance
-        mock.return_value = mock_instance
+@pytest.fixture(scope="session")
+def confirmation_service():
+    """Global confirmation service singleton, resolved once per session."""
+    from app.core.confirmation import get_confirmation_service
 
-        yield mock_instance
+    return get_confirmation_service()
 
 
-# ============================================================================
-# API Test Fixtures
-# ============================================================================
-
-
-@pytest.fixture
-def api_client() -> TestClient:
-    """FastAPI test client."""
-    return TestClient(app)
+@pytest.fixture(scope="session", autouse=True)
+def reset_confirmation_service(confirmation_service):
+    """Clear pending confirmations at the start and end of each worker session."""
+    confirmation_service.clear_all()
+    yield
+    confirmation_service.clear_all()
 
 
 @pytest.fixture
@@ -297,7 +222,7 @@ def sample_chat_request() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_headers() -> Dict[str, str]:
     """Sample HTTP headers for API requests."""
     return {
@@ -311,6 +236,16 @@ def sample_headers() -> Dict[str, str]:
 # ============================================================================
 
 
+def pytest_addoption(parser):
+    """Add the --loop option selecting the asyncio event loop."""
+    parser.addoption(
+        "--loop",
+        choices=("uvloop", "pyloop"),
+        default="uvloop",
+        help="Event loop for async tests: uvloop (default, if installed) or pyloop",
+    )
+
+
 def pytest_configure(config):
     """Configure pytest with custom markers."""
     config.addinivalue_line("markers", "unit: Unit tests")
@@ -319,12 +254,26 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "requires_api: Tests requiring real API access")
 
 
-@pytest.fixture(scope="session")
-def event_loop_policy():
-    """Set event loop policy for async tests."""
-    import asyncio
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
 
-    return asyncio.get_event_loop_policy()
+
+@pytest.fixture(scope="session")
+def event_loop_policy(request):
+    """Event loop policy for async tests, selected with --loop."""
+    if request.config.getoption("--loop") == "uvloop":
+        try:
+            import uvloop
+        except ImportError:  # not installed (e.g. Windows)
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+
+    return asyncio.DefaultEventLoopPolicy()
 
 
 # ============================================================================
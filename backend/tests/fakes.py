@@ -0,0 +1,80 @@
+"""
+Test Fakes
+
+Hand-rolled stand-ins for external clients. Plain coroutines returning preset
+data are much cheaper to call than AsyncMock and need no spec introspection.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class FakeGristClient:
+    """In-memory GristAPIClient serving preset tables, columns and records."""
+
+    tables: List[Dict[str, Any]]
+    columns: Dict[str, List[Dict[str, Any]]]
+    records: Dict[str, List[Dict[str, Any]]]
+    closed: bool = False
+    # (table_id, records) of every add_records call, in call order
+    add_records_calls: List[Tuple[str, List[Dict[str, Any]]]] = field(
+        default_factory=list
+    )
+
+    async def get_tables(self) -> List[Dict[str, Any]]:
+        return self.tables
+
+    async def get_table_columns(self, table_id: str) -> List[Dict[str, Any]]:
+        return self.columns.get(table_id, [])
+
+    async def get_records(
+        self, table_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        records = self.records.get(table_id, [])
+        return records[:limit] if limit else records
+
+    async def query_sql(
+        self, query: str, args: Optional[List] = None
+    ) -> List[Dict[str, Any]]:
+        # Simple fake: return all students for any query
+        return self.records.get("Students", [])
+
+    async def add_records(
+        self, table_id: str, records: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        self.add_records_calls.append((table_id, records))
+        return {
+            "records": [{"id": i + 100, **record} for i, record in enumerate(records)]
+        }
+
+    async def update_records(
+        self, table_id: str, records: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {"updated": len(records)}
+
+    async def delete_records(
+        self, table_id: str, record_ids: List[int]
+    ) -> Dict[str, Any]:
+        return {"deleted": len(record_ids)}
+
+    async def add_table(
+        self, table_id: str, columns: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {"table_id": table_id, "columns": len(columns)}
+
+    async def add_column(
+        self, table_id: str, column_id: str, fields: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {"column_id": column_id}
+
+    async def update_column(
+        self, table_id: str, column_id: str, fields: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {"updated": True}
+
+    async def delete_column(self, table_id: str, column_id: str) -> Dict[str, Any]:
+        return {"deleted": True}
+
+    async def close(self) -> None:
+        self.closed = True
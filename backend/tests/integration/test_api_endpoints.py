@@ -4,69 +4,84 @@ Integration Tests for API Endpoints
 Tests for FastAPI endpoints with mocked dependencies.
 """
 
+import dataclasses
+
+import orjson
 import pytest
 from unittest.mock import AsyncMock, patch
 
 from fastapi import status
 
-
-@pytest.mark.integration
-class TestHealthEndpoint:
-    """Tests for /health endpoint."""
-
-    def test_health_check(self, api_client):
-        """Test health check endpoint."""
-        response = api_client.get("/api/v1/health")
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert "version" in data
-
-
-@pytest.mark.integration
-class TestChatEndpoint:
-    """Tests for /chat endpoint."""
-
-    def test_chat_missing_api_key(self, api_client, sample_chat_request):
-        """Test chat endpoint without API key."""
-        response = api_client.post("/api/v1/chat", json=sample_chat_request)
-
-        # Should fail without x-api-key header
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-
-    @patch("app.api.routes.GristAgent")
-    def test_chat_success(
-        self, mock_agent_class, api_client, sample_chat_request, sample_headers
-    ):
-        """Test successful chat request."""
-        # Mock the agent
-        mock_agent = AsyncMock()
-        mock_agent.run.return_value = {
+from app.models import (
+    ConfirmationDecision,
+    ConfirmationStatus,
+    OperationPreview,
+    OperationType,
+)
+
+# The confirmation singleton is process-global; --dist loadfile keeps the whole
+# file on one xdist worker
+pytestmark = pytest.mark.integration
+
+# Preview shared by the confirm tests; vary it with dataclasses.replace(...)
+PREVIEW_TEMPLATE = OperationPreview(
+    operation_type=OperationType.DELETE_RECORDS,
+    description="Delete records",
+    affected_count=1,
+    warnings=[],
+    is_reversible=False,
+)
+
+# Decisions for a confirmation id that was never created
+APPROVE_MISSING = {"confirmation_id": "conf_doesnotexist", "approved": True}
+REJECT_MISSING = {"confirmation_id": "conf_doesnotexist", "approved": False}
+
+# Chat requests differing from the ``sample_chat_request`` fixture, serialized
+# once at import and posted as raw bytes
+SQL_REQUEST_BODY = orjson.dumps(
+    {
+        "messages": [
+            {
+                "id": "msg-1",
+                "role": "user",
+                "parts": [
+                    {"type": "text", "text": "Show me all students older than 18"}
+                ],
+            }
+        ],
+        "documentId": "test-doc",
+    }
+)
+
+CONTENT_FIELD_REQUEST_BODY = orjson.dumps(
+    {
+        "messages": [
+            {
+                "id": "msg-1",
+                "role": "user",
+                "content": "What tables are in this document?",
+            }
+        ],
+        "documentId": "test-doc",
+    }
+)
+
+# (request body, agent output, expected response fields); a None body means
+# the ``sample_chat_request`` fixture is posted
+CHAT_CASES = [
+    pytest.param(
+        None,
+        {
             "output": "This document has 3 tables.",
             "intermediate_steps": [],
             "success": True,
-        }
-        mock_agent.cleanup = AsyncMock()
-        mock_agent_class.return_value = mock_agent
-
-        response = api_client.post(
-            "/api/v1/chat", json=sample_chat_request, headers=sample_headers
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert "response" in data
-        assert data["response"] == "This document has 3 tables."
-
-    @patch("app.api.routes.GristAgent")
-    def test_chat_with_tool_calls(
-        self, mock_agent_class, api_client, sample_chat_request, sample_headers
-    ):
-        """Test chat request with tool calls."""
-        # Mock agent with tool calls
-        mock_agent = AsyncMock()
-        mock_agent.run.return_value = {
+        },
+        {"response": "This document has 3 tables.", "tool_calls": None},
+        id="success",
+    ),
+    pytest.param(
+        None,
+        {
             "output": "The document has these tables: Students, Projects.",
             "intermediate_steps": [
                 (
@@ -75,43 +90,22 @@ class TestChatEndpoint:
                 )
             ],
             "success": True,
-        }
-        mock_agent.cleanup = AsyncMock()
-        mock_agent_class.return_value = mock_agent
-
-        response = api_client.post(
-            "/api/v1/chat", json=sample_chat_request, headers=sample_headers
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert "tool_calls" in data
-        assert len(data["tool_calls"]) == 1
-        assert data["tool_calls"][0]["tool_name"] == "get_tables"
-
-    @patch("app.api.routes.GristAgent")
-    def test_chat_with_sql_query(self, mock_agent_class, api_client, sample_headers):
-        """Test chat request that executes SQL query."""
-        # Request with query
-        request_data = {
-            "messages": [
+        },
+        {
+            "tool_calls": [
                 {
-                    "id": "msg-1",
-                    "role": "user",
-                    "parts": [
-                        {
-                            "type": "text",
-                            "text": "Show me all students older than 18",
-                        }
-                    ],
+                    "tool_name": "get_tables",
+                    "tool_input": {},
+                    "tool_output": [{"id": "Students"}, {"id": "Projects"}],
                 }
             ],
-            "documentId": "test-doc",
-        }
-
-        # Mock agent with SQL query
-        mock_agent = AsyncMock()
-        mock_agent.run.return_value = {
+            "sql_query": None,
+        },
+        id="tool_calls",
+    ),
+    pytest.param(
+        SQL_REQUEST_BODY,
+        {
             "output": "Found 2 students.",
             "intermediate_steps": [
                 (
@@ -124,121 +118,134 @@ class TestChatEndpoint:
                 )
             ],
             "success": True,
-        }
-        mock_agent.cleanup = AsyncMock()
-        mock_agent_class.return_value = mock_agent
+        },
+        {"sql_query": "SELECT * FROM Students WHERE Age > 18"},
+        id="sql_query",
+    ),
+    pytest.param(
+        None,
+        {
+            "output": "I encountered an error.",
+            "intermediate_steps": [],
+            "success": False,
+            "error": "Table not found",
+        },
+        {"error": "Table not found"},
+        id="agent_error",
+    ),
+    pytest.param(
+        CONTENT_FIELD_REQUEST_BODY,
+        {"output": "Response", "intermediate_steps": [], "success": True},
+        {"response": "Response"},
+        id="content_field",
+    ),
+]
 
-        response = api_client.post(
-            "/api/v1/chat", json=request_data, headers=sample_headers
-        )
+
+class TestHealthEndpoint:
+    """Tests for /health endpoint."""
+
+    async def test_health_check(self, api_client):
+        """Test health check endpoint."""
+        response = await api_client.get("/api/v1/health")
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert data["sql_query"] == "SELECT * FROM Students WHERE Age > 18"
+        assert data["status"] == "healthy"
+        assert "version" in data
+
+
+class TestChatEndpoint:
+    """Tests for /chat endpoint."""
 
-    def test_chat_no_user_message(self, api_client, sample_headers):
+    @pytest.fixture(scope="class")
+    def patched_agent_class(self):
+        """Patch GristAgent in the routes module once for the whole class."""
+        with patch("app.api.routes.GristAgent") as mock_agent_class:
+            yield mock_agent_class
+
+    @pytest.fixture
+    def mock_agent_class(self, patched_agent_class):
+        """Patched GristAgent class, reset before each test."""
+        patched_agent_class.reset_mock(return_value=True, side_effect=True)
+        return patched_agent_class
+
+    async def test_chat_missing_api_key(self, api_client, sample_chat_request):
+        """Test chat endpoint without API key."""
+        response = await api_client.post("/api/v1/chat", json=sample_chat_request)
+
+        # Should fail without x-api-key header
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_chat_no_user_message(self, api_client, sample_headers):
         """Test chat request with no user message."""
         request_data = {
             "messages": [],
             "documentId": "test-doc",
         }
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat", json=request_data, headers=sample_headers
         )
 
         # Should return 400 for no user message
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("app.api.routes.GristAgent")
-    def test_chat_agent_error(
-        self, mock_agent_class, api_client, sample_chat_request, sample_headers
+    @pytest.mark.parametrize("request_body,agent_output,expected", CHAT_CASES)
+    async def test_chat_scenarios(
+        self,
+        mock_agent_class,
+        api_client,
+        sample_chat_request,
+        sample_headers,
+        request_body,
+        agent_output,
+        expected,
     ):
-        """Test chat request when agent encounters an error."""
-        # Mock agent to return error
+        """Test chat responses for the agent outputs in CHAT_CASES."""
         mock_agent = AsyncMock()
-        mock_agent.run.return_value = {
-            "output": "I encountered an error.",
-            "intermediate_steps": [],
-            "success": False,
-            "error": "Table not found",
-        }
+        mock_agent.run.return_value = agent_output
         mock_agent.cleanup = AsyncMock()
         mock_agent_class.return_value = mock_agent
 
-        response = api_client.post(
-            "/api/v1/chat", json=sample_chat_request, headers=sample_headers
-        )
+        if request_body is None:
+            response = await api_client.post(
+                "/api/v1/chat", json=sample_chat_request, headers=sample_headers
+            )
+        else:
+            response = await api_client.post(
+                "/api/v1/chat", content=request_body, headers=sample_headers
+            )
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert data["error"] == "Table not found"
-
-    def test_chat_with_content_field(self, api_client, sample_headers):
-        """Test chat with legacy content field instead of parts."""
-        request_data = {
-            "messages": [
-                {
-                    "id": "msg-1",
-                    "role": "user",
-                    "content": "What tables are in this document?",
-                }
-            ],
-            "documentId": "test-doc",
-        }
+        for key, value in expected.items():
+            assert data[key] == value
 
-        with patch("app.api.routes.GristAgent") as mock_agent_class:
-            mock_agent = AsyncMock()
-            mock_agent.run.return_value = {
-                "output": "Response",
-                "intermediate_steps": [],
-                "success": True,
-            }
-            mock_agent.cleanup = AsyncMock()
-            mock_agent_class.return_value = mock_agent
 
-            response = api_client.post(
-                "/api/v1/chat", json=request_data, headers=sample_headers
-            )
-
-            assert response.status_code == status.HTTP_200_OK
-
-
-@pytest.mark.integration
 class TestConfirmEndpoint:
     """Tests for /chat/confirm endpoint."""
 
     @pytest.fixture(autouse=True)
-    def setup_and_cleanup(self):
+    def setup_and_cleanup(self, confirmation_service):
         """Clear confirmation service before and after each test."""
-        from app.core.confirmation import get_confirmation_service
-
-        service = get_confirmation_service()
-        service.clear_all()
+        confirmation_service.clear_all()
         yield
-        service.clear_all()
+        confirmation_service.clear_all()
 
-    def test_confirm_operation_reject(self, api_client, sample_headers):
+    async def test_confirm_operation_reject(
+        self, api_client, sample_headers, confirmation_service
+    ):
         """Test rejecting a confirmation."""
-        from app.models import (
-            ConfirmationDecision,
-            ConfirmationStatus,
-            OperationPreview,
-            OperationType,
-        )
-        from app.core.confirmation import get_confirmation_service
-
         # Create a pending confirmation
-        service = get_confirmation_service()
-        preview = OperationPreview(
-            operation_type=OperationType.DELETE_RECORDS,
+        preview = dataclasses.replace(
+            PREVIEW_TEMPLATE,
             description="Delete 5 records",
             affected_count=5,
             warnings=["Irreversible"],
-            is_reversible=False,
         )
 
-        confirmation = service.create_confirmation(
+        confirmation = confirmation_service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="remove_records",
             tool_args={"table_id": "Students", "record_ids": [1, 2, 3, 4, 5]},
@@ -252,7 +259,7 @@ class TestConfirmEndpoint:
             reason="Changed my mind",
         )
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
             json=decision.model_dump(),
             headers=sample_headers,
@@ -264,32 +271,22 @@ class TestConfirmEndpoint:
         assert "cancelled" in data["message"].lower()
 
         # Should be removed from pending
-        assert service.get_pending_count() == 0
+        assert confirmation_service.get_pending_count() == 0
 
     @patch("app.api.routes.get_all_tools")
-    def test_confirm_operation_approve(
-        self, mock_get_tools, api_client, sample_headers
+    async def test_confirm_operation_approve(
+        self, mock_get_tools, api_client, sample_headers, confirmation_service
     ):
         """Test approving and executing a confirmation."""
-        from app.models import (
-            ConfirmationDecision,
-            ConfirmationStatus,
-            OperationPreview,
-            OperationType,
-        )
-        from app.core.confirmation import get_confirmation_service
-
         # Create a pending confirmation
-        service = get_confirmation_service()
-        preview = OperationPreview(
-            operation_type=OperationType.DELETE_RECORDS,
+        preview = dataclasses.replace(
+            PREVIEW_TEMPLATE,
             description="Delete 2 records",
             affected_count=2,
             warnings=["Irreversible"],
-            is_reversible=False,
         )
 
-        confirmation = service.create_confirmation(
+        confirmation = confirmation_service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="remove_records",
             tool_args={
@@ -312,7 +309,7 @@ class TestConfirmEndpoint:
             approved=True,
         )
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
             json=decision.model_dump(),
             headers=sample_headers,
@@ -325,49 +322,30 @@ class TestConfirmEndpoint:
         assert data["result"]["deleted_count"] == 2
 
         # Should be removed from pending
-        assert service.get_pending_count() == 0
+        assert confirmation_service.get_pending_count() == 0
 
         # Tool should have been called
         mock_tool.ainvoke.assert_called_once()
 
-    def test_confirm_operation_not_found(self, api_client, sample_headers):
+    async def test_confirm_operation_not_found(self, api_client, sample_headers):
         """Test confirming non-existent confirmation."""
-        from app.models import ConfirmationDecision
-
-        decision = ConfirmationDecision(
-            confirmation_id="conf_doesnotexist",
-            approved=True,
-        )
-
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
-            json=decision.model_dump(),
+            json=APPROVE_MISSING,
             headers=sample_headers,
         )
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "not found" in response.json()["detail"].lower()
 
-    def test_confirm_operation_expired(self, api_client, sample_headers):
+    async def test_confirm_operation_expired(
+        self, api_client, sample_headers, confirmation_service
+    ):
         """Test confirming expired confirmation."""
-        from app.models import (
-            ConfirmationDecision,
-            OperationPreview,
-            OperationType,
-        )
-        from app.core.confirmation import get_confirmation_service
-
         # Create a confirmation that expires immediately
-        service = get_confirmation_service()
-        preview = OperationPreview(
-            operation_type=OperationType.DELETE_RECORDS,
-            description="Delete records",
-            affected_count=1,
-            warnings=[],
-            is_reversible=False,
-        )
+        preview = PREVIEW_TEMPLATE
 
-        confirmation = service.create_confirmation(
+        confirmation = confirmation_service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="remove_records",
             tool_args={},
@@ -381,7 +359,7 @@ class TestConfirmEndpoint:
             approved=True,
         )
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
             json=decision.model_dump(),
             headers=sample_headers,
@@ -390,45 +368,24 @@ class TestConfirmEndpoint:
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "not found or expired" in response.json()["detail"].lower()
 
-    def test_confirm_operation_reject_not_found(self, api_client, sample_headers):
+    async def test_confirm_operation_reject_not_found(self, api_client, sample_headers):
         """Test rejecting non-existent confirmation."""
-        from app.models import ConfirmationDecision
-
-        decision = ConfirmationDecision(
-            confirmation_id="conf_doesnotexist",
-            approved=False,
-        )
-
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
-            json=decision.model_dump(),
+            json=REJECT_MISSING,
             headers=sample_headers,
         )
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     @patch("app.api.routes.get_all_tools")
-    def test_confirm_operation_tool_not_found(
-        self, mock_get_tools, api_client, sample_headers
+    async def test_confirm_operation_tool_not_found(
+        self, mock_get_tools, api_client, sample_headers, confirmation_service
     ):
         """Test approving when tool doesn't exist."""
-        from app.models import (
-            ConfirmationDecision,
-            OperationPreview,
-            OperationType,
-        )
-        from app.core.confirmation import get_confirmation_service
+        preview = PREVIEW_TEMPLATE
 
-        service = get_confirmation_service()
-        preview = OperationPreview(
-            operation_type=OperationType.DELETE_RECORDS,
-            description="Delete records",
-            affected_count=1,
-            warnings=[],
-            is_reversible=False,
-        )
-
-        confirmation = service.create_confirmation(
+        confirmation = confirmation_service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="nonexistent_tool",
             tool_args={"document_id": "test"},
@@ -443,7 +400,7 @@ class TestConfirmEndpoint:
             approved=True,
         )
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
             json=decision.model_dump(),
             headers=sample_headers,
@@ -453,28 +410,13 @@ class TestConfirmEndpoint:
         assert "not found" in response.json()["detail"].lower()
 
     @patch("app.api.routes.get_all_tools")
-    def test_confirm_operation_tool_execution_error(
-        self, mock_get_tools, api_client, sample_headers
+    async def test_confirm_operation_tool_execution_error(
+        self, mock_get_tools, api_client, sample_headers, confirmation_service
     ):
         """Test handling tool execution errors."""
-        from app.models import (
-            ConfirmationDecision,
-            ConfirmationStatus,
-            OperationPreview,
-            OperationType,
-        )
-        from app.core.confirmation import get_confirmation_service
+        preview = PREVIEW_TEMPLATE
 
-        service = get_confirmation_service()
-        preview = OperationPreview(
-            operation_type=OperationType.DELETE_RECORDS,
-            description="Delete records",
-            affected_count=1,
-            warnings=[],
-            is_reversible=False,
-        )
-
-        confirmation = service.create_confirmation(
+        confirmation = confirmation_service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="remove_records",
             tool_args={"table_id": "Students", "document_id": "test"},
@@ -492,7 +434,7 @@ class TestConfirmEndpoint:
             approved=True,
         )
 
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
             json=decision.model_dump(),
             headers=sample_headers,
@@ -503,31 +445,23 @@ class TestConfirmEndpoint:
         assert data["status"] == ConfirmationStatus.APPROVED
         assert "failed" in data["message"].lower()
 
-    def test_confirm_operation_missing_api_key(self, api_client):
+    async def test_confirm_operation_missing_api_key(self, api_client):
         """Test endpoint requires API key."""
-        from app.models import ConfirmationDecision
-
-        decision = ConfirmationDecision(
-            confirmation_id="conf_test",
-            approved=True,
-        )
-
-        response = api_client.post(
+        response = await api_client.post(
             "/api/v1/chat/confirm",
-            json=decision.model_dump(),
+            json=APPROVE_MISSING,
         )
 
         # Should fail without x-api-key header
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.integration
 class TestRootEndpoint:
     """Tests for root endpoint."""
 
-    def test_root_endpoint(self, api_client):
+    async def test_root_endpoint(self, api_client):
         """Test root endpoint returns API info."""
-        response = api_client.get("/")
+        response = await api_client.get("/")
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
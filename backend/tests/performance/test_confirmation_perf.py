@@ -0,0 +1,69 @@
+"""
+Performance Tests for Confirmation Service
+
+Micro-benchmarks (pytest-benchmark) for confirmation creation and cleanup.
+Run with ``make test-performance`` to compare against the last saved run.
+"""
+
+import pytest
+
+from app.core.confirmation import ConfirmationService
+from app.models import OperationPreview, OperationType
+
+PREVIEW = OperationPreview(
+    operation_type=OperationType.DELETE_RECORDS,
+    description="Delete 1 record",
+    affected_count=1,
+    warnings=[],
+    is_reversible=False,
+)
+
+
+@pytest.mark.performance
+class TestConfirmationPerformance:
+    """Throughput benchmarks for ConfirmationService."""
+
+    def test_create_cleanup_throughput(self, benchmark):
+        """Benchmark creating 1000 short-lived confirmations then cleaning up."""
+        service = ConfirmationService()
+
+        def bench():
+            for _ in range(1000):
+                service.create_confirmation(
+                    operation_type=OperationType.DELETE_RECORDS,
+                    tool_name="remove_records",
+                    tool_args={"table_id": "Students", "record_ids": [1]},
+                    preview=PREVIEW,
+                    expires_in_seconds=0,
+                )
+            return service.cleanup_expired()
+
+        # Each create reclaims the previous (already due) one: only the last remains
+        assert benchmark(bench) == 1
+        assert service.get_pending_count() == 0
+
+    def test_cleanup_with_many_pending(self, benchmark):
+        """Benchmark cleanup when few of many pending confirmations expired."""
+        service = ConfirmationService()
+        for _ in range(10_000):
+            service.create_confirmation(
+                operation_type=OperationType.DELETE_RECORDS,
+                tool_name="remove_records",
+                tool_args={},
+                preview=PREVIEW,
+            )
+
+        def bench():
+            for _ in range(10):
+                service.create_confirmation(
+                    operation_type=OperationType.DELETE_RECORDS,
+                    tool_name="remove_records",
+                    tool_args={},
+                    preview=PREVIEW,
+                    expires_in_seconds=0,
+                )
+            return service.cleanup_expired()
+
+        # Each create reclaims the previous (already due) one: only the last remains
+        assert benchmark(bench) == 1
+        assert service.get_pending_count() == 10_000
@@ -4,10 +4,40 @@ Unit Tests for GristAgent
 Tests for agent orchestration and execution.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from langchain_core.messages import AIMessage
+
 from app.core.agent import GristAgent
+from app.core.llm_cache import LLMCache, MemoryBackend
+from app.core.prompts import SYSTEM_PROMPT_PREFIX
+from app.models import settings
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patched_get_llm():
+    """Patch get_llm once for the module; each agent gets a fresh mock LLM."""
+
+    def make_llm():
+        llm = MagicMock()
+        llm.bind_tools = MagicMock(return_value=llm)
+        return llm
+
+    with patch("app.core.agent.get_llm", side_effect=make_llm) as mock_get_llm:
+        yield mock_get_llm
+
+
+def scripted_llm(*responses):
+    """Build an ainvoke replacement returning the given responses in order."""
+    it = iter(responses)
+
+    async def _call(*args, **kwargs):
+        return next(it)
+
+    return _call
 
 
 @pytest.mark.unit
@@ -16,19 +46,18 @@ class TestGristAgent:
     """Tests for GristAgent."""
 
     @pytest.fixture
-    def agent(self, mock_grist_service, mock_llm):
+    def agent(self, mock_grist_service):
         """Create a GristAgent with mocked dependencies."""
-        with patch("app.core.agent.get_llm", return_value=mock_llm):
-            agent = GristAgent(
-                document_id="test-doc",
-                grist_token="test-token",
-                max_iterations=3,
-                verbose=False,
-            )
-            # Replace the service with our mock
-            agent.grist_service = mock_grist_service
-
-            return agent
+        agent = GristAgent(
+            document_id="test-doc",
+            grist_token="test-token",
+            max_iterations=3,
+            verbose=False,
+        )
+        # Replace the service with our mock
+        agent.grist_service = mock_grist_service
+
+        return agent
 
     async def test_agent_initialization(self, agent):
         """Test agent initialization."""
@@ -38,27 +67,24 @@ class TestGristAgent:
         assert len(agent.tools) == 13
         assert agent.system_prompt is not None
 
-    async def test_agent_cleanup(self, mock_grist_service, mock_llm):
+    async def test_agent_cleanup(self, mock_grist_service):
         """Test agent cleanup."""
-        with patch("app.core.agent.get_llm", return_value=mock_llm):
-            agent = GristAgent(
-                document_id="test-doc",
-                grist_token="test-token",
-                max_iterations=3,
-                verbose=False,
-            )
-            # Mock the close method
-            mock_grist_service.close = AsyncMock()
-            agent.grist_service = mock_grist_service
-
-            await agent.cleanup()
-            mock_grist_service.close.assert_called_once()
+        agent = GristAgent(
+            document_id="test-doc",
+            grist_token="test-token",
+            max_iterations=3,
+            verbose=False,
+        )
+        # Mock the close method
+        mock_grist_service.close = AsyncMock()
+        agent.grist_service = mock_grist_service
+
+        await agent.cleanup()
+        mock_grist_service.close.assert_called_once()
 
     async def test_agent_run_simple_query(self, agent):
         """Test agent execution with simple query."""
         # Mock the LLM to return a response without tool calls
-        from langchain_core.messages import AIMessage
-
         agent.llm_with_tools.ainvoke = AsyncMock(
             return_value=AIMessage(content="This document has 3 tables.")
         )
@@ -71,8 +97,6 @@ class TestGristAgent:
 
     async def test_agent_run_with_tool_calls(self, agent, sample_tables):
         """Test agent execution with tool calls."""
-        from langchain_core.messages import AIMessage
-
         # Mock LLM to first request tool call, then give final answer
         tool_call_response = AIMessage(
             content="",
@@ -88,9 +112,7 @@ class TestGristAgent:
             content="The document has 3 tables: Students, Projects, and Grades."
         )
 
-        agent.llm_with_tools.ainvoke = AsyncMock(
-            side_effect=[tool_call_response, final_response]
-        )
+        agent.llm_with_tools.ainvoke = scripted_llm(tool_call_response, final_response)
 
         result = await agent.run("List all tables")
 
@@ -98,10 +120,81 @@ class TestGristAgent:
         assert len(result["intermediate_steps"]) == 1
         assert result["intermediate_steps"][0][0]["name"] == "get_tables"
 
+    async def test_agent_parallel_tool_calls(self, agent):
+        """Test that read-only tool calls from one LLM turn run concurrently."""
+        started = 0
+        all_started = asyncio.Event()
+
+        def make_tool(name):
+            async def ainvoke(args):
+                nonlocal started
+                started += 1
+                if started == 2:
+                    all_started.set()
+                # Only completes if the other call is running at the same time
+                await asyncio.wait_for(all_started.wait(), timeout=1)
+                return f"{name} result"
+
+            tool = MagicMock()
+            tool.ainvoke = ainvoke
+            return tool
+
+        agent.tools_by_name["get_tables"] = make_tool("get_tables")
+        agent.tools_by_name["get_table_columns"] = make_tool("get_table_columns")
+
+        tool_call_response = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "get_tables", "args": {}, "id": "call_1"},
+                {
+                    "name": "get_table_columns",
+                    "args": {"table_id": "Students"},
+                    "id": "call_2",
+                },
+            ],
+        )
+        agent.llm_with_tools.ainvoke = scripted_llm(
+            tool_call_response, AIMessage(content="Done.")
+        )
+
+        result = await agent.run("Describe the tables")
+
+        assert result["success"] is True
+        assert result["metrics"]["failed_tool_calls"] == 0
+        # Results are recorded in the order the LLM requested them
+        assert [step[0]["name"] for step in result["intermediate_steps"]] == [
+            "get_tables",
+            "get_table_columns",
+        ]
+        assert [step[1] for step in result["intermediate_steps"]] == [
+            "get_tables result",
+            "get_table_columns result",
+        ]
+
+    async def test_agent_llm_cache_hit(self, mock_grist_service):
+        """Test repeated deterministic prompts are answered from the LLM cache."""
+        with patch.object(settings, "llm_cache_enabled", True), patch.object(
+            settings, "llm_temperature", 0.0
+        ), patch(
+            "app.core.agent.get_llm_cache",
+            return_value=LLMCache(MemoryBackend()),
+        ):
+            agent = GristAgent(document_id="test-doc", grist_token="test-token")
+        agent.grist_service = mock_grist_service
+
+        ainvoke = AsyncMock(
+            return_value=AIMessage(content="This document has 3 tables.")
+        )
+        agent.llm_with_tools.llm.ainvoke = ainvoke
+
+        first = await agent.run("What tables are in this document?")
+        second = await agent.run("What tables are in this document?")
+
+        assert first["output"] == second["output"] == "This document has 3 tables."
+        assert ainvoke.call_count == 1
+
     async def test_agent_max_iterations(self, agent):
         """Test that agent stops at max iterations."""
-        from langchain_core.messages import AIMessage
-
         # Mock LLM to always request tools (infinite loop)
         tool_call_response = AIMessage(
             content="",
@@ -114,7 +207,9 @@ class TestGristAgent:
             ],
         )
 
-        agent.llm_with_tools.ainvoke = AsyncMock(return_value=tool_call_response)
+        agent.llm_with_tools.ainvoke = scripted_llm(
+            *[tool_call_response] * agent.max_iterations
+        )
 
         result = await agent.run("Test query")
 
@@ -124,8 +219,6 @@ class TestGristAgent:
 
     async def test_agent_run_with_chat_history(self, agent):
         """Test agent with conversation history."""
-        from langchain_core.messages import AIMessage
-
         agent.llm_with_tools.ainvoke = AsyncMock(
             return_value=AIMessage(content="Yes, I remember.")
         )
@@ -149,10 +242,21 @@ class TestGristAgent:
         assert agent.current_page_id == 2
         assert agent.system_prompt != original_prompt
 
+    async def test_prompt_prefix_stable(self, agent):
+        """Test that context updates only change the prompt suffix."""
+        original_prompt = agent.system_prompt
+
+        agent.update_context(
+            page_name="new_page", page_id=2, table_id="Projects", table_name="Projects"
+        )
+
+        # Provider-side prompt caching relies on an identical leading prefix
+        for prompt in (original_prompt, agent.system_prompt):
+            assert prompt.startswith(SYSTEM_PROMPT_PREFIX)
+            assert len(SYSTEM_PROMPT_PREFIX) >= 0.9 * len(prompt)
+
     async def test_agent_tool_execution_error(self, agent):
         """Test agent handling of tool execution errors."""
-        from langchain_core.messages import AIMessage
-
         # Mock LLM to request tool that will fail
         tool_call_response = AIMessage(
             content="",
@@ -166,9 +270,7 @@ class TestGristAgent:
         )
         final_response = AIMessage(content="There was an error accessing that table.")
 
-        agent.llm_with_tools.ainvoke = AsyncMock(
-            side_effect=[tool_call_response, final_response]
-        )
+        agent.llm_with_tools.ainvoke = scripted_llm(tool_call_response, final_response)
 
         # Make the tool raise an error
         agent.grist_service.get_table_columns = AsyncMock(
@@ -189,36 +291,24 @@ class TestAgentConfiguration:
 
     def test_agent_uses_settings(self):
         """Test that agent uses settings for configuration."""
-        from app.models import settings
-
-        with patch("app.core.agent.get_llm") as mock_get_llm:
-            mock_llm = MagicMock()
-            mock_llm.bind_tools = MagicMock(return_value=mock_llm)
-            mock_get_llm.return_value = mock_llm
-
-            agent = GristAgent(
-                document_id="test",
-                grist_token="token",
-            )
+        agent = GristAgent(
+            document_id="test",
+            grist_token="token",
+        )
 
-            # Should use settings values
-            assert agent.max_iterations == settings.agent_max_iterations
-            assert agent.base_url == settings.grist_base_url
+        # Should use settings values
+        assert agent.max_iterations == settings.agent_max_iterations
+        assert agent.base_url == settings.grist_base_url
 
     def test_agent_override_settings(self):
         """Test that agent can override settings."""
-        with patch("app.core.agent.get_llm") as mock_get_llm:
-            mock_llm = MagicMock()
-            mock_llm.bind_tools = MagicMock(return_value=mock_llm)
-            mock_get_llm.return_value = mock_llm
-
-            agent = GristAgent(
-                document_id="test",
-                grist_token="token",
-                max_iterations=10,
-                base_url="https://custom.grist.com",
-            )
-
-            # Should use override values
-            assert agent.max_iterations == 10
-            assert agent.base_url == "https://custom.grist.com"
+        agent = GristAgent(
+            document_id="test",
+            grist_token="token",
+            max_iterations=10,
+            base_url="https://custom.grist.com",
+        )
+
+        # Should use override values
+        assert agent.max_iterations == 10
+        assert agent.base_url == "https://custom.grist.com"
@@ -5,7 +5,6 @@ Tests for confirmation workflow management.
 """
 
 import pytest
-from datetime import datetime, timedelta
 
 from app.core.confirmation import (
     ConfirmationService,
@@ -163,13 +162,14 @@ class TestConfirmationService:
             is_reversible=False,
         )
 
-        # Create some confirmations with different expirations
+        # Create some confirmations with different expirations (the expired one
+        # last, since each create already drops entries that are due)
         service.create_confirmation(
             operation_type=OperationType.DELETE_RECORDS,
             tool_name="remove_records",
             tool_args={},
             preview=preview,
-            expires_in_seconds=0,  # Expired
+            expires_in_seconds=300,  # Valid
         )
 
         service.create_confirmation(
@@ -177,7 +177,7 @@ class TestConfirmationService:
             tool_name="remove_records",
             tool_args={},
             preview=preview,
-            expires_in_seconds=300,  # Valid
+            expires_in_seconds=0,  # Expired
         )
 
         # Cleanup
@@ -185,6 +185,65 @@ class TestConfirmationService:
         assert cleaned == 1
         assert service.get_pending_count() == 1
 
+    def test_cleanup_expired_large_n(self, service):
+        """Test cleanup only removes expired entries among valid ones."""
+        preview = OperationPreview(
+            operation_type=OperationType.DELETE_RECORDS,
+            description="Test",
+            affected_count=1,
+            warnings=[],
+            is_reversible=False,
+        )
+
+        for _ in range(50):
+            service.create_confirmation(
+                operation_type=OperationType.DELETE_RECORDS,
+                tool_name="remove_records",
+                tool_args={},
+                preview=preview,
+                expires_in_seconds=300,
+            )
+        expired = [
+            service.create_confirmation(
+                operation_type=OperationType.DELETE_RECORDS,
+                tool_name="remove_records",
+                tool_args={},
+                preview=preview,
+                expires_in_seconds=0,
+            )
+            for _ in range(2)
+        ]
+        # A rejected confirmation leaves a stale heap entry that must not count
+        service.reject_confirmation(expired[0].confirmation_id)
+
+        assert service.cleanup_expired() == 1
+        assert service.get_pending_count() == 50
+
+    def test_expiry_heap_bounded(self, service):
+        """Test approved and rejected confirmations do not accumulate in the heap."""
+        preview = OperationPreview(
+            operation_type=OperationType.DELETE_RECORDS,
+            description="Test",
+            affected_count=1,
+            warnings=[],
+            is_reversible=False,
+        )
+
+        for i in range(100):
+            confirmation = service.create_confirmation(
+                operation_type=OperationType.DELETE_RECORDS,
+                tool_name="remove_records",
+                tool_args={},
+                preview=preview,
+                expires_in_seconds=0,  # Due by the next create
+            )
+            if i % 2:
+                service.approve_confirmation(confirmation.confirmation_id)
+            else:
+                service.reject_confirmation(confirmation.confirmation_id)
+
+        assert len(service._expiry_heap) <= 1
+
     def test_multiple_confirmations(self, service):
         """Test managing multiple confirmations."""
         preview = OperationPreview(
@@ -4,15 +4,21 @@ Unit Tests for GristService
 Tests for high-level Grist service operations.
 """
 
+import httpx
+import orjson
 import pytest
-from unittest.mock import AsyncMock
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
 
+from app.services.grist_client import GristAPIClient, SharedClientRegistry
 from app.services.grist_service import GristService
 from app.models import (
+    GristAPIException,
     TableNotFoundException,
     ColumnNotFoundException,
     ValidationException,
 )
+from tests.fakes import FakeGristClient
 
 
 @pytest.mark.unit
@@ -47,6 +53,19 @@ class TestGristService:
         )
         assert isinstance(results, list)
 
+    async def test_query_document_large_result(
+        self, mock_grist_service, mock_grist_client
+    ):
+        """Test large query results are truncated to 100 rows."""
+        mock_grist_client.records["Students"] = [
+            {"id": i, "fields": {"Age": 20}} for i in range(1, 1001)
+        ]
+
+        results = await mock_grist_service.query_document("SELECT * FROM Students")
+
+        assert len(results) == 100
+        assert [r["id"] for r in results[:3]] == [1, 2, 3]
+
     async def test_add_records(self, mock_grist_service):
         """Test adding records."""
         new_records = [
@@ -57,6 +76,39 @@ class TestGristService:
         assert "record_ids" in result
         assert result["count"] == 2
 
+    async def test_add_records_in_batches(self, mock_grist_service, mock_grist_client):
+        """Test large inserts are split into ADD_RECORDS_BATCH_SIZE requests."""
+        new_records = [{"Name": f"Student {i}"} for i in range(1200)]
+
+        result = await mock_grist_service.add_records("Students", new_records)
+
+        batches = [records for _, records in mock_grist_client.add_records_calls]
+        assert result["count"] == 1200
+        assert [len(batch) for batch in batches] == [500, 500, 200]
+
+    async def test_add_records_batch_failure(
+        self, mock_grist_service, mock_grist_client
+    ):
+        """Test a failed batch stops the insert and reports the records created."""
+        add_records = mock_grist_client.add_records
+
+        async def fail_second_batch(table_id, records):
+            if mock_grist_client.add_records_calls:
+                mock_grist_client.add_records_calls.append((table_id, records))
+                raise httpx.HTTPError("Server error")
+            return await add_records(table_id, records)
+
+        mock_grist_client.add_records = fail_second_batch
+        new_records = [{"Name": f"Student {i}"} for i in range(1200)]
+
+        with pytest.raises(GristAPIException) as exc_info:
+            await mock_grist_service.add_records("Students", new_records)
+
+        # The third batch is never sent
+        assert len(mock_grist_client.add_records_calls) == 2
+        assert exc_info.value.details["record_ids"] == list(range(100, 600))
+        assert "Only 500 of 1200" in str(exc_info.value)
+
     async def test_update_records(self, mock_grist_service):
         """Test updating records."""
         result = await mock_grist_service.update_records(
@@ -122,17 +174,24 @@ class TestGristService:
         result = await mock_grist_service.remove_table_column("Students", "Age")
         assert result["deleted"] is True
 
-    async def test_service_cleanup(self, mock_grist_client):
-        """Test service cleanup."""
-        service = GristService(
-            document_id="test",
-            access_token="token",
-            enable_validation=False,
-        )
-        service.client = mock_grist_client
+    async def test_service_cleanup(self):
+        """Test service cleanup leaves the shared HTTP client to the registry."""
+        registry = SharedClientRegistry()
+        with patch(
+            "app.services.grist_client.get_client_registry", return_value=registry
+        ):
+            service = GristService(
+                document_id="test",
+                access_token="token",
+                enable_validation=False,
+            )
+        http_client = service.client.client
 
         await service.close()
-        mock_grist_client.close.assert_called_once()
+        assert not http_client.is_closed
+
+        await registry.aclose_all()
+        assert http_client.is_closed
 
     async def test_context_manager(self, mock_grist_client):
         """Test service as async context manager."""
@@ -146,39 +205,117 @@ class TestGristService:
             assert len(tables) > 0
 
         # Verify cleanup was called
-        mock_grist_client.close.assert_called()
+        assert mock_grist_client.closed
 
 
 @pytest.mark.unit
+@pytest.mark.asyncio
 class TestGristServiceValidation:
-    """Tests for GristService with validation enabled."""
+    """Tests for GristService with validation enabled and disabled."""
 
-    @pytest.mark.asyncio
-    async def test_validation_enabled(self, mock_grist_client, sample_tables):
-        """Test that validation service is created when enabled."""
+    @pytest_asyncio.fixture(
+        scope="class",
+        loop_scope="session",
+        params=[True, False],
+        ids=["enabled", "disabled"],
+    )
+    async def svc(self, request):
+        """One GristService per validation mode, shared by the whole class."""
         service = GristService(
             document_id="test",
             access_token="token",
-            enable_validation=True,
+            enable_validation=request.param,
         )
-        service.client = mock_grist_client
+        service.client = FakeGristClient(
+            tables=[{"id": "Students", "label": "Students"}], columns={}, records={}
+        )
+        yield service
+        await service.close()
 
-        validator = service._get_validator()
-        assert validator is not None
+    async def test_validator(self, svc):
+        """Test that the validation service is created (once) only when enabled."""
+        validator = svc._get_validator()
+        assert (validator is not None) is svc.enable_validation
+        assert svc._get_validator() is validator
 
-        await service.close()
+    async def test_unknown_table(self, svc):
+        """Test that unknown tables are only rejected when validation is enabled."""
+        if svc.enable_validation:
+            with pytest.raises(TableNotFoundException):
+                await svc.add_records("NonExistentTable", [{"foo": "bar"}])
+        else:
+            # Should not raise even with invalid table
+            await svc.add_records("NonExistentTable", [{"foo": "bar"}])
 
-    @pytest.mark.asyncio
-    async def test_validation_disabled(self, mock_grist_client):
-        """Test that validation is skipped when disabled."""
-        service = GristService(
-            document_id="test",
-            access_token="token",
-            enable_validation=False,
-        )
-        service.client = mock_grist_client
 
-        # Should not raise even with invalid table
-        await service.add_records("NonExistentTable", [{"foo": "bar"}])
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGristAPIClient:
+    """Tests for the low-level GristAPIClient."""
 
-        await service.close()
+    async def test_query_sql_decodes_response(self):
+        """Test SQL responses are decoded into records."""
+        records = [{"fields": {"Name": "Élodie", "Age": 30}}] * 3
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/api/docs/test-doc/sql"
+            return httpx.Response(200, content=orjson.dumps({"records": records}))
+
+        registry = SharedClientRegistry(transport=httpx.MockTransport(handler))
+        with patch(
+            "app.services.grist_client.get_client_registry", return_value=registry
+        ):
+            client = GristAPIClient(document_id="test-doc", access_token="token")
+
+        results = await client.query_sql("SELECT * FROM Students")
+
+        assert results == records
+        await registry.aclose_all()
+
+    async def test_shared_http_client_per_base_url(self):
+        """Test clients for the same Grist instance share one HTTP client."""
+        registry = SharedClientRegistry()
+        with patch(
+            "app.services.grist_client.get_client_registry", return_value=registry
+        ):
+            first = GristAPIClient(document_id="doc-1", access_token="token")
+            second = GristAPIClient(document_id="doc-2", access_token="token")
+            other = GristAPIClient(
+                document_id="doc-3",
+                access_token="token",
+                base_url="https://grist.example.com",
+            )
+
+        assert first.client is second.client
+        assert other.client is not first.client
+
+        await registry.aclose_all()
+        # A closed client is replaced on next use
+        assert not registry.get(first.base_url).is_closed
+        await registry.aclose_all()
+
+    async def test_shared_http_client_ignores_cookies(self):
+        """Test a cookie set for one client is never sent by another."""
+        sent_cookies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent_cookies.append(request.headers.get("cookie"))
+            return httpx.Response(
+                200,
+                content=orjson.dumps({"records": []}),
+                headers={"set-cookie": "grist_sid=USER_A_SESSION; Path=/"},
+            )
+
+        registry = SharedClientRegistry(transport=httpx.MockTransport(handler))
+        with patch(
+            "app.services.grist_client.get_client_registry", return_value=registry
+        ):
+            user_a = GristAPIClient(document_id="doc-a", access_token="token-a")
+            user_b = GristAPIClient(document_id="doc-b", access_token="token-b")
+
+        await user_a.query_sql("SELECT * FROM Students")
+        await user_b.query_sql("SELECT * FROM Students")
+
+        assert user_a.client is user_b.client
+        assert sent_cookies == [None, None]
+        await registry.aclose_all()
@@ -0,0 +1,126 @@
+"""
+Unit Tests for LLM Response Cache
+
+Tests for the memory backend, cache keys and the CachedLLM wrapper.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.core.llm_cache import CachedLLM, LLMCache, MemoryBackend
+
+
+@pytest.mark.unit
+class TestMemoryBackend:
+    """Tests for MemoryBackend."""
+
+    def test_get_set(self):
+        """Test storing and retrieving a value."""
+        backend = MemoryBackend()
+        backend.set("key", "value")
+
+        assert backend.get("key") == "value"
+        assert backend.get("missing") is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")  # "b" becomes least recently used
+        backend.set("c", 3)
+
+        assert backend.get("b") is None
+        assert backend.get("a") == 1
+        assert backend.get("c") == 3
+        assert len(backend) == 2
+
+    def test_ttl_expiration(self):
+        """Test entries expire after their TTL."""
+        backend = MemoryBackend(ttl_seconds=300)
+
+        with patch("app.core.llm_cache.time.monotonic", return_value=1000.0):
+            backend.set("key", "value")
+        with patch("app.core.llm_cache.time.monotonic", return_value=1300.0):
+            assert backend.get("key") is None
+
+        assert len(backend) == 0
+
+
+@pytest.mark.unit
+class TestLLMCacheKey:
+    """Tests for LLMCache.make_key."""
+
+    def test_same_call_same_key(self):
+        """Test the key ignores message ids."""
+        first = [HumanMessage(content="Hello", id="msg-1")]
+        second = [HumanMessage(content="Hello", id="msg-2")]
+
+        assert LLMCache.make_key("model", first, []) == LLMCache.make_key(
+            "model", second, []
+        )
+
+    def test_key_depends_on_call(self):
+        """Test model, messages and tools are all part of the key."""
+        messages = [HumanMessage(content="Hello")]
+        key = LLMCache.make_key("model", messages, [])
+
+        assert key != LLMCache.make_key("other-model", messages, [])
+        assert key != LLMCache.make_key("model", [HumanMessage(content="Hi")], [])
+        assert key != LLMCache.make_key("model", messages, [{"name": "get_tables"}])
+
+    def test_key_ignores_dict_order(self):
+        """Test keys are canonical (sorted) 128-bit digests."""
+        messages = [HumanMessage(content="Hello")]
+        key = LLMCache.make_key("model", messages, [{"name": "a", "type": "function"}])
+
+        assert key == LLMCache.make_key(
+            "model", messages, [{"type": "function", "name": "a"}]
+        )
+        assert len(key) == 32
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCachedLLM:
+    """Tests for CachedLLM."""
+
+    @pytest.fixture
+    def llm(self):
+        """Mock tool-bound LLM."""
+        llm = AsyncMock()
+        llm.ainvoke = AsyncMock(return_value=AIMessage(content="Answer"))
+        return llm
+
+    @pytest.fixture
+    def messages(self):
+        """Conversation sent to the LLM."""
+        return [SystemMessage(content="System"), HumanMessage(content="Question")]
+
+    async def test_deterministic_calls_cached(self, llm, messages):
+        """Test identical calls at temperature 0 hit the cache."""
+        cached_llm = CachedLLM(llm, LLMCache(MemoryBackend()), "model", 0.0)
+
+        first = await cached_llm.ainvoke(messages)
+        second = await cached_llm.ainvoke(messages)
+
+        assert first.content == second.content == "Answer"
+        assert llm.ainvoke.call_count == 1
+
+    async def test_non_zero_temperature_bypasses_cache(self, llm, messages):
+        """Test sampling calls are never cached."""
+        cached_llm = CachedLLM(llm, LLMCache(MemoryBackend()), "model", 0.7)
+
+        await cached_llm.ainvoke(messages)
+        await cached_llm.ainvoke(messages)
+
+        assert llm.ainvoke.call_count == 2
+
+    async def test_attribute_delegation(self, llm):
+        """Test other attributes are forwarded to the wrapped LLM."""
+        llm.model_name = "model"
+        cached_llm = CachedLLM(llm, LLMCache(MemoryBackend()), "model", 0.0)
+
+        assert cached_llm.model_name == "model"
@@ -4,8 +4,10 @@ Unit Tests for Pydantic Models
 Tests for data validation and serialization in API and data models.
 """
 
+import dataclasses
+
 import pytest
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from app.models import (
     ChatRequest,
@@ -185,6 +187,27 @@ class TestModelSerialization:
     def test_record_serialization(self):
         """Test Record serialization."""
         record = Record(id=1, fields={"Name": "John", "Age": 30})
-        data = record.model_dump()
+        data = TypeAdapter(Record).dump_python(record)
         assert data["id"] == 1
         assert data["fields"]["Name"] == "John"
+
+    def test_model_dump_exclude_none(self):
+        """Test exclude_none drops unset optional fields."""
+        table = TableInfo(id="Students")
+        assert table.model_dump(exclude_none=True) == {"id": "Students"}
+
+    def test_grist_models_are_frozen(self):
+        """Test Grist data models are immutable and ignore unknown fields."""
+        record = Record(id=1, fields={"Name": "John"}, manualSort=1)
+        assert not hasattr(record, "manualSort")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.id = 2
+
+        table = TableInfo(id="Students")
+        with pytest.raises(ValidationError):
+            table.id = "Projects"
+
+    def test_record_has_slots(self):
+        """Test records are slotted (no per-instance __dict__)."""
+        assert not hasattr(Record(id=1, fields={}), "__dict__")
@@ -4,181 +4,278 @@ Unit Tests for Preview Service
 Tests for operation preview generation.
 """
 
+import re
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import create_autospec
 
+from app.services.grist_service import GristService
 from app.services.preview_service import PreviewService
 from app.models import OperationType
 
 
+def frozen_rows(*rows):
+    """Read-only rows (tuple of MappingProxyType) shared by every test."""
+    return tuple(MappingProxyType(row) for row in rows)
+
+
+# Canned GristService results; immutable so a mutating service cannot leak
+# state between tests
+TWO_STUDENTS = frozen_rows(
+    {"id": 1, "Name": "John", "Age": 20},
+    {"id": 2, "Name": "Jane", "Age": 21},
+)
+TWO_GRADES = frozen_rows(
+    {"id": 1, "Name": "John", "Grade": "B"},
+    {"id": 2, "Name": "Jane", "Grade": "C"},
+)
+COUNT25 = frozen_rows({"count": 25})
+NAME_AGE_COLUMNS = frozen_rows(
+    {"id": "Name", "fields": {"type": "Text", "label": "Full Name"}},
+    {"id": "Age", "fields": {"type": "Int", "label": "Age"}},
+)
+AGE_COLUMN = frozen_rows({"id": "Age", "fields": {"type": "Int", "label": "Age"}})
+
+# Expected warnings, matched against the joined warnings (one per line)
+IRREVERSIBLE = re.compile(r"IRRÉVERSIBLE")
+TEXT_TO_INT = re.compile(r"'Text' vers 'Int'")
+LOSSY = re.compile(r"PERTE DE DONNÉES")
+HAS_DATA_25 = re.compile(r"25 enregistrement\(s\)")
+BULK_UPDATE_15 = re.compile(r"Modification massive : 15 enregistrements")
+
+# 15-record update payload for the bulk-warning test, built once at import
+BULK_IDS = tuple(range(1, 16))
+BULK_RECORDS = tuple({"Grade": "A"} for _ in range(15))
+
+# (preview method, kwargs, mocked service results {attribute: return value},
+# operation type, affected count, warning patterns, description)
+PREVIEW_CASES = [
+    pytest.param(
+        "preview_remove_records",
+        {"table_id": "Students", "record_ids": [1, 2, 3, 4, 5]},
+        {"query_document": TWO_STUDENTS},
+        OperationType.DELETE_RECORDS,
+        5,
+        (IRREVERSIBLE,),
+        "Supprimer 5 enregistrement(s) de la table 'Students'",
+        id="remove_records",
+    ),
+    pytest.param(
+        "preview_remove_column",
+        {"table_id": "Students", "column_id": "Age"},
+        {"get_table_columns": NAME_AGE_COLUMNS, "query_document": COUNT25},
+        OperationType.DELETE_COLUMN,
+        25,
+        (IRREVERSIBLE, HAS_DATA_25),
+        "Supprimer la colonne 'Age' de la table 'Students'",
+        id="remove_column",
+    ),
+    pytest.param(
+        "preview_update_records",
+        {
+            "table_id": "Students",
+            "record_ids": [1, 2],
+            "records": [{"Grade": "A"}, {"Grade": "A"}],
+        },
+        {"query_document": TWO_GRADES},
+        OperationType.UPDATE_RECORDS,
+        2,
+        (),
+        "Modifier 2 enregistrement(s) dans la table 'Students'",
+        id="update_records",
+    ),
+    pytest.param(
+        "preview_update_column_type",
+        {
+            "table_id": "Students",
+            "column_id": "Age",
+            "old_type": "Text",
+            "new_type": "Int",
+        },
+        {},
+        OperationType.UPDATE_COLUMN_TYPE,
+        1,
+        (TEXT_TO_INT,),
+        "Changer le type de la colonne 'Age' de Text vers Int",
+        id="update_column_type",
+    ),
+    pytest.param(
+        "preview_update_column_type",
+        {
+            "table_id": "Students",
+            "column_id": "Score",
+            "old_type": "Numeric",
+            "new_type": "Int",
+        },
+        {},
+        OperationType.UPDATE_COLUMN_TYPE,
+        1,
+        # Decimals are truncated
+        (LOSSY,),
+        "Changer le type de la colonne 'Score' de Numeric vers Int",
+        id="lossy_conversion",
+    ),
+]
+
+# (preview method, kwargs, mocked service results {attribute: return value},
+# failing service method, affected count, affected items, warning patterns)
+ERROR_CASES = [
+    pytest.param(
+        "preview_remove_records",
+        {"table_id": "Students", "record_ids": [1, 2, 3]},
+        {},
+        "query_document",
+        3,
+        [],
+        (IRREVERSIBLE,),
+        id="remove_records_query",
+    ),
+    pytest.param(
+        "preview_remove_column",
+        {"table_id": "Students", "column_id": "Age"},
+        {"get_table_columns": AGE_COLUMN},
+        "query_document",
+        # Count defaults to 0 records
+        0,
+        [
+            {
+                "table": "Students",
+                "column": "Age",
+                "label": "Age",
+                "records_with_data": 0,
+            }
+        ],
+        (IRREVERSIBLE,),
+        id="remove_column_count",
+    ),
+    pytest.param(
+        "preview_update_records",
+        {"table_id": "Students", "record_ids": [1], "records": [{"Grade": "A"}]},
+        {},
+        "query_document",
+        1,
+        # No current values to show
+        [{"id": 1, "before": {}, "after": {"Grade": "A"}, "changes": ["Grade"]}],
+        (),
+        id="update_records_query",
+    ),
+]
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestPreviewService:
     """Tests for PreviewService."""
 
-    @pytest.fixture
-    def preview_service(self, mock_grist_service):
-        """Create a preview service with mocked Grist service."""
-        return PreviewService(mock_grist_service)
-
-    async def test_preview_remove_records(self, preview_service, mock_grist_service):
-        """Test preview for record deletion."""
-        # Mock query to return sample records
-        mock_grist_service.query_document = AsyncMock(
-            return_value=[
-                {"id": 1, "Name": "John", "Age": 20},
-                {"id": 2, "Name": "Jane", "Age": 21},
-            ]
-        )
-
-        preview = await preview_service.preview_remove_records(
-            table_id="Students", record_ids=[1, 2, 3, 4, 5]
-        )
-
-        assert preview.operation_type == OperationType.DELETE_RECORDS
-        assert preview.affected_count == 5
-        assert preview.is_reversible is False
-        assert len(preview.warnings) > 0
-        assert "IRRÉVERSIBLE" in preview.warnings[0]
-        assert (
-            preview.description
-            == "Supprimer 5 enregistrement(s) de la table 'Students'"
-        )
-
-    async def test_preview_remove_column(self, preview_service, mock_grist_service):
-        """Test preview for column deletion."""
-        # Mock get_table_columns
-        mock_grist_service.get_table_columns = AsyncMock(
-            return_value=[
-                {"id": "Name", "fields": {"type": "Text", "label": "Full Name"}},
-                {"id": "Age", "fields": {"type": "Int", "label": "Age"}},
-            ]
-        )
-
-        # Mock query to count records with data
-        mock_grist_service.query_document = AsyncMock(return_value=[{"count": 25}])
+    @pytest.fixture(scope="class")
+    def grist_service(self):
+        """Autospec'd GristService, built once; its methods are AsyncMocks."""
+        return create_autospec(GristService, instance=True, spec_set=True)
+
+    @pytest.fixture(scope="class")
+    def preview_service(self, grist_service):
+        """One preview service for the class (stateless apart from its service)."""
+        return PreviewService(grist_service=grist_service)
+
+    @pytest.fixture(autouse=True)
+    def _reset_grist_service(self, grist_service):
+        """Clear results, side effects and calls left by the previous test."""
+        grist_service.reset_mock(return_value=True, side_effect=True)
+
+    @pytest.mark.parametrize(
+        "method,kwargs,mocks,op,count,warnings,description", PREVIEW_CASES
+    )
+    async def test_preview(
+        self,
+        preview_service,
+        grist_service,
+        method,
+        kwargs,
+        mocks,
+        op,
+        count,
+        warnings,
+        description,
+    ):
+        """Test each preview method's operation, count, warnings and description."""
+        for attr, value in mocks.items():
+            getattr(grist_service, attr).return_value = value
 
-        preview = await preview_service.preview_remove_column(
-            table_id="Students", column_id="Age"
-        )
+        preview = await getattr(preview_service, method)(**kwargs)
 
-        assert preview.operation_type == OperationType.DELETE_COLUMN
-        assert preview.affected_count == 25
+        assert preview.operation_type == op
+        assert preview.affected_count == count
         assert preview.is_reversible is False
-        assert any("IRRÉVERSIBLE" in w for w in preview.warnings)
-        assert any("25 enregistrement(s)" in w for w in preview.warnings)
+        assert preview.description == description
+        blob = "\n".join(preview.warnings)
+        for pattern in warnings:
+            assert pattern.search(blob)
 
-    async def test_preview_update_records(self, preview_service, mock_grist_service):
-        """Test preview for record updates."""
+    async def test_preview_update_records_before_after(
+        self, preview_service, grist_service
+    ):
+        """Test record update previews show before/after values."""
         # Mock query to return current records
-        mock_grist_service.query_document = AsyncMock(
-            return_value=[
-                {"id": 1, "Name": "John", "Grade": "B"},
-                {"id": 2, "Name": "Jane", "Grade": "C"},
-            ]
-        )
-
-        new_records = [
-            {"Grade": "A"},
-            {"Grade": "A"},
-        ]
+        grist_service.query_document.return_value = TWO_GRADES
 
         preview = await preview_service.preview_update_records(
-            table_id="Students", record_ids=[1, 2], records=new_records
+            table_id="Students",
+            record_ids=[1, 2],
+            records=[{"Grade": "A"}, {"Grade": "A"}],
         )
 
-        assert preview.operation_type == OperationType.UPDATE_RECORDS
-        assert preview.affected_count == 2
+        grist_service.query_document.assert_awaited_once()
         assert len(preview.affected_items) == 2
 
         # Check before/after
         item = preview.affected_items[0]
-        assert "before" in item
-        assert "after" in item
-        assert "changes" in item
-        assert "Grade" in item["changes"]
+        assert item["before"]["Grade"] == "B"
+        assert item["after"]["Grade"] == "A"
+        assert item["changes"] == ["Grade"]
 
     async def test_preview_update_records_bulk_warning(
-        self, preview_service, mock_grist_service
+        self, preview_service, grist_service
     ):
         """Test that bulk updates show warning."""
-        mock_grist_service.query_document = AsyncMock(return_value=[])
-
-        # Create 15 records update
-        record_ids = list(range(1, 16))
-        records = [{"Grade": "A"} for _ in range(15)]
+        grist_service.query_document.return_value = []
 
+        # Fresh lists at the API boundary; the payload itself is shared
         preview = await preview_service.preview_update_records(
-            table_id="Students", record_ids=record_ids, records=records
-        )
-
-        assert preview.affected_count == 15
-        assert any("Modification massive" in w for w in preview.warnings)
-        assert any("15 enregistrements" in w for w in preview.warnings)
-
-    async def test_preview_update_column_type(self, preview_service):
-        """Test preview for column type change."""
-        preview = await preview_service.preview_update_column_type(
             table_id="Students",
-            column_id="Age",
-            old_type="Text",
-            new_type="Int",
-        )
-
-        assert preview.operation_type == OperationType.UPDATE_COLUMN_TYPE
-        assert preview.affected_count == 1
-        assert preview.is_reversible is False
-        assert any("Text" in w and "Int" in w for w in preview.warnings)
-
-    async def test_preview_column_type_lossy_conversion(self, preview_service):
-        """Test preview shows warning for lossy conversions."""
-        preview = await preview_service.preview_update_column_type(
-            table_id="Students",
-            column_id="Score",
-            old_type="Numeric",
-            new_type="Int",
-        )
-
-        # Should warn about potential data loss (decimals truncated)
-        assert any("PERTE DE DONNÉES" in w for w in preview.warnings)
-
-    async def test_preview_remove_records_query_error(
-        self, preview_service, mock_grist_service
-    ):
-        """Test preview handles query errors gracefully."""
-        # Make query fail
-        mock_grist_service.query_document = AsyncMock(
-            side_effect=Exception("Query failed")
+            record_ids=list(BULK_IDS),
+            records=list(BULK_RECORDS),
         )
 
-        # Should not crash, just return empty affected_items
-        preview = await preview_service.preview_remove_records(
-            table_id="Students", record_ids=[1, 2, 3]
-        )
-
-        assert preview.affected_count == 3
-        assert preview.affected_items == []
-        assert len(preview.warnings) > 0
-
-    async def test_preview_remove_column_count_error(
-        self, preview_service, mock_grist_service
+        assert preview.affected_count == 15
+        assert BULK_UPDATE_15.search("\n".join(preview.warnings))
+
+    @pytest.mark.parametrize(
+        "method,kwargs,mocks,attr,count,items,warnings", ERROR_CASES
+    )
+    async def test_preview_service_error(
+        self,
+        preview_service,
+        grist_service,
+        method,
+        kwargs,
+        mocks,
+        attr,
+        count,
+        items,
+        warnings,
     ):
-        """Test preview handles count query errors."""
-        mock_grist_service.get_table_columns = AsyncMock(
-            return_value=[
-                {"id": "Age", "fields": {"type": "Int", "label": "Age"}},
-            ]
-        )
-
-        # Make count query fail
-        mock_grist_service.query_document = AsyncMock(
-            side_effect=Exception("Count failed")
-        )
-
-        preview = await preview_service.preview_remove_column(
-            table_id="Students", column_id="Age"
-        )
-
-        # Should default to 0 records
-        assert preview.affected_count == 0
-        assert any("IRRÉVERSIBLE" in w for w in preview.warnings)
+        """Test previews degrade gracefully when a Grist call fails."""
+        for name, value in mocks.items():
+            getattr(grist_service, name).return_value = value
+        getattr(grist_service, attr).side_effect = Exception(f"{attr} failed")
+
+        # Should not crash, just fall back to defaults
+        preview = await getattr(preview_service, method)(**kwargs)
+
+        getattr(grist_service, attr).assert_awaited_once()
+        assert preview.affected_count == count
+        assert preview.affected_items == items
+        blob = "\n".join(preview.warnings)
+        for pattern in warnings:
+            assert pattern.search(blob)
@@ -186,3 +186,15 @@ class TestValidationService:
         validation_service.clear_cache()
         assert validation_service._tables_cache is None
         assert len(validation_service._columns_cache) == 0
+
+    async def test_validator_table_lookup_uses_cached_ids(self, validation_service):
+        """Test table checks resolve exact and case-insensitive ids from one cache."""
+        assert await validation_service.validate_table_exists("Students") == "Students"
+        table_ids = validation_service._table_ids
+
+        assert await validation_service.validate_table_exists("students") == "Students"
+        assert await validation_service.validate_table_exists("STUDENTS") == "Students"
+
+        # Filled once on first use, then reused
+        assert validation_service._table_ids is table_ids
+        assert table_ids >= {"Students", "Projects"}